@@ -17,6 +17,7 @@ error PositionNotAvailable();
 
 contract PlayerRate is Ownable, PlayerOwnership {
     using UnsafeMath8 for uint8;
+    using UnsafeMath256 for uint256;
 
     ILeagueTeam internal leagueTeam;
     ILeagueGame internal leagueGame;
@@ -34,8 +35,8 @@ contract PlayerRate is Ownable, PlayerOwnership {
     mapping(uint16 => uint256) public playerLastGame; // playerId => most recent game player was part of
     mapping(uint16 => bool) public isPlayerSignedUp;
     // 16 first positions are for home team, 16 last positions are for away team
-    mapping(uint8 => uint8) public positionIds; // matching the two different codes of positionId
-    mapping(uint256 => mapping(uint8 => uint8)) public layoutPositions; // matching the positionsId with the positions list in each different layout
+    uint8[256] internal positionCodes; // matching the two different codes of positionId, packed 32 per storage slot
+    mapping(uint256 => uint8[16]) internal layouts; // positions list of each different layout, packed in one storage slot
 
     event updateGameDuration(uint256 duration);
     event updateDurationBetweenGames(uint256 duration);
@@ -47,6 +48,8 @@ contract PlayerRate is Ownable, PlayerOwnership {
     );
     event positionStored(uint8 positionId, uint8 positionCode);
     event layoutStored(uint8 layoutId, uint8[16] layoutPositions);
+    event positionsStored(bytes32 positionCodesHash); // keccak256 of the ABI encoded table
+    event layoutsStored(uint8 firstLayoutId, uint8[16][] layoutsPositions);
 
     constructor(
         address _LeagueGame,
@@ -115,19 +118,19 @@ contract PlayerRate is Ownable, PlayerOwnership {
                 _bonus = _bonus.unsafe_increment();
             }
             if (
-                layoutPositions[_layoutId][i] ==
-                positionIds[
+                layouts[_layoutId][i] ==
+                positionCodes[
                     verifiableRandomFootballer.tokenIdToAttributes(_playerId, 0)
                 ]
             ) {
                 // Bonus for preferred position
                 _bonus = UnsafeMath8.unsafe_add(_bonus, 2);
             } else if (
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 1) ||
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 2) ||
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 3)
             ) {
                 // Bonus for compatible position
@@ -239,19 +242,19 @@ contract PlayerRate is Ownable, PlayerOwnership {
                 _bonus += 1;
             }
             if (
-                layoutPositions[_layoutId][i] ==
-                positionIds[
+                layouts[_layoutId][i] ==
+                positionCodes[
                     verifiableRandomFootballer.tokenIdToAttributes(_playerId, 0)
                 ]
             ) {
                 // Bonus for preferred position
                 _bonus += 2;
             } else if (
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 1) ||
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 2) ||
-                layoutPositions[_layoutId][i] ==
+                layouts[_layoutId][i] ==
                 verifiableRandomFootballer.tokenIdToAttributes(_playerId, 3)
             ) {
                 // Bonus for compatible position
@@ -372,7 +375,7 @@ contract PlayerRate is Ownable, PlayerOwnership {
         public
         onlyOwner
     {
-        positionIds[_positionId] = _positionCode;
+        positionCodes[_positionId] = _positionCode;
         emit positionStored(_positionId, _positionCode);
     }
 
@@ -380,9 +383,51 @@ contract PlayerRate is Ownable, PlayerOwnership {
         public
         onlyOwner
     {
-        for (uint8 i = 0; i < 16; i = i.unsafe_increment()) {
-            layoutPositions[_layoutId][i] = _positions[i];
-        }
+        layouts[_layoutId] = _positions;
         emit layoutStored(_layoutId, _positions);
     }
+
+    // Stores the whole positions table in a single transaction (8 storage slots)
+    // The event only carries the hash of the table, the codes are in the transaction input
+    function storePositions(uint8[256] calldata _positionCodes)
+        external
+        onlyOwner
+    {
+        positionCodes = _positionCodes;
+        emit positionsStored(keccak256(abi.encode(_positionCodes)));
+    }
+
+    // Stores consecutive layouts in a single transaction (one storage slot per layout)
+    function storeLayouts(
+        uint8 _firstLayoutId,
+        uint8[16][] calldata _layoutsPositions
+    ) external onlyOwner {
+        for (
+            uint256 i = 0;
+            i < _layoutsPositions.length;
+            i = i.unsafe_increment()
+        ) {
+            layouts[_firstLayoutId + i] = _layoutsPositions[i];
+        }
+        emit layoutsStored(_firstLayoutId, _layoutsPositions);
+    }
+
+    function positionIds(uint8 _positionId)
+        external
+        view
+        returns (uint8 positionId)
+    {
+        positionId = positionCodes[_positionId];
+    }
+
+    // Returns 0 for the positions above the 16 of a layout, as the former mapping did
+    function layoutPositions(uint256 _layoutId, uint8 _position)
+        external
+        view
+        returns (uint8 positionId)
+    {
+        if (_position < 16) {
+            positionId = layouts[_layoutId][_position];
+        }
+    }
 }
@@ -0,0 +1,48 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+// Same interface as Multicall2, deployed on the networks where no multicall contract is available
+contract Multicall {
+    struct Call {
+        address target;
+        bytes callData;
+    }
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function tryAggregate(bool _requireSuccess, Call[] calldata _calls)
+        public
+        returns (Result[] memory returnData)
+    {
+        returnData = new Result[](_calls.length);
+        for (uint256 i = 0; i < _calls.length; ) {
+            (bool success, bytes memory result) = _calls[i].target.call(
+                _calls[i].callData
+            );
+            if (_requireSuccess) require(success, "Multicall: call failed");
+            returnData[i] = Result(success, result);
+            unchecked {
+                ++i;
+            }
+        }
+    }
+
+    function tryBlockAndAggregate(bool _requireSuccess, Call[] calldata _calls)
+        external
+        returns (
+            uint256 blockNumber,
+            bytes32 blockHash,
+            Result[] memory returnData
+        )
+    {
+        blockNumber = block.number;
+        blockHash = blockhash(block.number);
+        returnData = tryAggregate(_requireSuccess, _calls);
+    }
+
+    function getBlockNumber() external view returns (uint256 blockNumber) {
+        blockNumber = block.number;
+    }
+}
@@ -0,0 +1,131 @@
+import json
+from brownie import PlayerRate
+from scripts.indexer import connect, register_derived_table
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS appearances (
+    player_id INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    block_signed INTEGER,
+    defense_rate INTEGER,
+    attack_rate INTEGER,
+    settled_block INTEGER,
+    PRIMARY KEY (player_id, game_id)
+);
+CREATE INDEX IF NOT EXISTS appearances_by_game ON appearances (game_id);
+CREATE INDEX IF NOT EXISTS appearances_by_block ON appearances (block_signed);
+CREATE INDEX IF NOT EXISTS appearances_by_settlement ON appearances (settled_block);
+"""
+
+
+def player_rate_address(db):
+    row = db.execute(
+        "SELECT address FROM cursors WHERE contract = 'PlayerRate'"
+    ).fetchone()
+    return row[0] if row else PlayerRate[-1].address
+
+
+def on_player_signed_up(db, address, row):
+    # The rates are set when the game is finished
+    # The sign up block only comes from the event, getGamePlayers returns 0 for the home
+    # players once the game is settled
+    args = json.loads(row[6])
+    db.execute(
+        "INSERT INTO appearances VALUES (?, ?, ?, ?, NULL, NULL, NULL) "
+        "ON CONFLICT (player_id, game_id) DO UPDATE SET position = excluded.position, "
+        "block_signed = excluded.block_signed",
+        (args["playerId"], args["gameId"], args["position"], row[2]),
+    )
+
+
+def read_game_players(db, address, row, pending_rows):
+    # A single getGamePlayers call settles the appearances of the 32 positions
+    game_id = json.loads(row[6])["gameId"]
+    return PlayerRate.at(player_rate_address(db)).getGamePlayers(game_id)
+
+
+def on_game_finished(db, address, row, game_players):
+    # The contracts are indexed in parallel, so the sign ups of the game may not be stored yet,
+    # their block_signed stays NULL until the playerSignedUp event is stored
+    game_id = json.loads(row[6])["gameId"]
+    db.executemany(
+        "INSERT INTO appearances VALUES (?, ?, ?, NULL, ?, ?, ?) "
+        "ON CONFLICT (player_id, game_id) DO UPDATE SET defense_rate = excluded.defense_rate, "
+        "attack_rate = excluded.attack_rate, settled_block = excluded.settled_block",
+        [
+            (
+                player_id,
+                game_id,
+                position,
+                defense_rate,
+                attack_rate,
+                row[2],
+            )
+            for position, (
+                player_id,
+                _,
+                defense_rate,
+                attack_rate,
+            ) in enumerate(game_players)
+            if player_id > 0
+        ],
+    )
+
+
+def rollback(db, fork_block):
+    # Sign ups of the reorganized blocks are removed, settlements are undone
+    db.execute("DELETE FROM appearances WHERE block_signed >= ?", (fork_block,))
+    db.execute(
+        "UPDATE appearances SET defense_rate = NULL, attack_rate = NULL, settled_block = NULL "
+        "WHERE settled_block >= ?",
+        (fork_block,),
+    )
+    # Settlements whose sign up was not indexed yet leave nothing behind
+    db.execute(
+        "DELETE FROM appearances WHERE block_signed IS NULL AND settled_block IS NULL"
+    )
+
+
+def register(db):
+    columns = db.execute("PRAGMA table_info(appearances)").fetchall()
+    if any(column[1] == "block_signed" and column[3] for column in columns):
+        # Tables created with a NOT NULL block_signed are filled again from the events
+        db.execute("DROP TABLE appearances")
+    register_derived_table(
+        db,
+        "appearances",
+        SCHEMA,
+        {
+            ("PlayerRate", "playerSignedUp"): on_player_signed_up,
+            ("LeagueGame", "gameFinished"): on_game_finished,
+        },
+        rollback,
+        {on_game_finished: read_game_players},
+    )
+
+
+def get_appearances(db, player_id):
+    # (gameId, position, block signed, defense rate, attack rate) of a player, most recent game first
+    # The rates are None until the game is finished
+    return db.execute(
+        "SELECT game_id, position, block_signed, defense_rate, attack_rate FROM appearances "
+        "WHERE player_id = ? ORDER BY game_id DESC",
+        (player_id,),
+    ).fetchall()
+
+
+def main(player_id=1):
+    db = connect()
+    register(db)
+    for game_id, position, block_signed, defense_rate, attack_rate in get_appearances(
+        db, int(player_id)
+    ):
+        rates = (
+            f"defense {defense_rate}, attack {attack_rate}"
+            if defense_rate is not None
+            else "not finished"
+        )
+        print(
+            f"Game {game_id} : position {position}, signed at block {block_signed}, {rates}"
+        )
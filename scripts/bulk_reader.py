@@ -0,0 +1,124 @@
+from brownie import (
+    VerifiableRandomFootballer,
+    LeagueTeam,
+    LeagueGame,
+    PlayerRate,
+    web3,
+)
+from scripts.helpful_scripts import get_contract
+
+BATCH_SIZE = 1000  # Number of view calls aggregated in a single eth_call
+MAX_SUPPLY = 10000
+
+
+def multicall(calls, block_identifier=None, batch_size=BATCH_SIZE):
+    # calls: list of (brownie contract call, args), e.g. (league_team.playersTeam, (12,))
+    # Returns the decoded outputs in the same order, None for the calls that reverted
+    # All the batches are read at the same block, the latest one by default
+    multicall_contract = get_contract("multicall")
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    results = []
+    for start in range(0, len(calls), batch_size):
+        batch = calls[start : start + batch_size]
+        returned = multicall_contract.tryAggregate.call(
+            False,
+            [(method._address, method.encode_input(*args)) for method, args in batch],
+            block_identifier=block_identifier,
+        )
+        for (method, _), (success, data) in zip(batch, returned):
+            results.append(method.decode_output(data) if success else None)
+    return results
+
+
+def read_footballers(verifiable_random_footballer, token_ids, block_identifier=None):
+    # tokenId => (owner, attributes), owner is None for a token not minted yet
+    calls = []
+    for token_id in token_ids:
+        calls.append((verifiable_random_footballer.ownerOf, (token_id,)))
+        calls += [
+            (verifiable_random_footballer.tokenIdToAttributes, (token_id, position))
+            for position in range(6)
+        ]
+    results = multicall(calls, block_identifier)
+    return {
+        token_id: (results[7 * i], list(results[7 * i + 1 : 7 * i + 7]))
+        for i, token_id in enumerate(token_ids)
+    }
+
+
+def read_players_team(league_team, player_ids, block_identifier=None):
+    results = multicall(
+        [(league_team.playersTeam, (player_id,)) for player_id in player_ids],
+        block_identifier,
+    )
+    return dict(zip(player_ids, results))
+
+
+def read_team_members(league_team, team_ids, block_identifier=None):
+    results = multicall(
+        [(league_team.teamMembersArray, (team_id,)) for team_id in team_ids],
+        block_identifier,
+    )
+    return {team_id: list(members) for team_id, members in zip(team_ids, results)}
+
+
+def read_team_games(league_game, team_ids, block_identifier=None):
+    # teamId => [status, gameId, layoutId, stake]
+    results = multicall(
+        [
+            (league_game.teamGame, (team_id, rank))
+            for team_id in team_ids
+            for rank in range(4)
+        ],
+        block_identifier,
+    )
+    return {
+        team_id: list(results[4 * i : 4 * i + 4]) for i, team_id in enumerate(team_ids)
+    }
+
+
+def read_game_players(player_rate, game_ids, block_identifier=None):
+    # gameId => 32 (playerId, blockSigned, defenseRate, attackRate)
+    results = multicall(
+        [(player_rate.getGamePlayers, (game_id,)) for game_id in game_ids],
+        block_identifier,
+    )
+    return {
+        game_id: [tuple(player) for player in players]
+        for game_id, players in zip(game_ids, results)
+    }
+
+
+def read_league_state(block_identifier=None, max_supply=MAX_SUPPLY):
+    # Token ids below max_supply are read
+    verifiable_random_footballer = VerifiableRandomFootballer[-1]
+    league_team = LeagueTeam[-1]
+    league_game = LeagueGame[-1]
+    player_rate = PlayerRate[-1]
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    team_ids = list(
+        range(1, league_team.nbOfTeams(block_identifier=block_identifier) + 1)
+    )
+    game_ids = list(range(1, league_game.gameIds(block_identifier=block_identifier)))
+    footballers = read_footballers(
+        verifiable_random_footballer, list(range(1, max_supply)), block_identifier
+    )
+    minted = [token_id for token_id, (owner, _) in footballers.items() if owner]
+    return {
+        "block_number": block_identifier,
+        "footballers": {token_id: footballers[token_id] for token_id in minted},
+        "players_team": read_players_team(league_team, minted, block_identifier),
+        "team_members": read_team_members(league_team, team_ids, block_identifier),
+        "team_games": read_team_games(league_game, team_ids, block_identifier),
+        "game_players": read_game_players(player_rate, game_ids, block_identifier),
+    }
+
+
+def main():
+    state = read_league_state()
+    print(
+        f"Block {state['block_number']} : {len(state['footballers'])} footballers, "
+        f"{len(state['team_members'])} teams, {len(state['game_players'])} games"
+    )
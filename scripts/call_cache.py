@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from brownie import web3
+
+BYTE_BUDGET = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 128  # Approximate size of the key tuple and the dict entry
+HEAD_TTL = 2  # Seconds the head block number is reused for, the Polygon block time
+# Method => {event: ids of the first argument of the call set by the event}
+# Once the event has been emitted the result of the call does not change anymore
+IMMUTABLE_AFTER = {
+    "tokenIdToAttributes": {"PlayerGenerated": lambda args: [args["tokenId"]]},
+    "positionIds": {
+        "positionStored": lambda args: [args["positionId"]],
+        # The event only carries the hash of the table, all the 256 position codes are stored
+        "positionsStored": lambda args: range(256),
+    },
+    "layoutPositions": {
+        "layoutStored": lambda args: [args["layoutId"]],
+        "layoutsStored": lambda args: range(
+            args["firstLayoutId"],
+            args["firstLayoutId"] + len(args["layoutsPositions"]),
+        ),
+    },
+}
+
+
+class CallCache:
+    # Read-through cache of eth_call results keyed on (address, calldata, block number)
+    # Immutable results are stored without block number and never invalidated
+    # The calls without block_identifier are pinned to the head block, read at most once per head_ttl
+    # With the database of the indexer, the final events of the league mark the immutable results
+    # each time the head is read. The sync runs in the thread reading the head, under the cache lock,
+    # so db must be opened with indexer.connect(path, check_same_thread=False)
+    def __init__(self, byte_budget=BYTE_BUDGET, head_ttl=HEAD_TTL, db=None):
+        self.byte_budget = byte_budget
+        self.head_ttl = head_ttl
+        self.head = None  # (block number, time.monotonic() of the read)
+        self.db = db
+        self.final_block = -1  # Last final block whose events have been processed
+        self.size = 0
+        # key => raw returned data, least recently used first
+        self.entries = OrderedDict()
+        self.final = set()  # (address, method, first argument) of the immutable results
+        self.lock = threading.RLock()  # Held for the whole sync of the final events
+        self.hits = 0
+        self.misses = 0
+
+    def finalize(self, address, method, first_argument):
+        with self.lock:
+            self.final.add((address, method, first_argument))
+
+    def process_event(self, address, event, args):
+        # Feed with the events of the contracts (EventWaiter, indexer, transaction receipts)
+        for method, final_events in IMMUTABLE_AFTER.items():
+            if event in final_events:
+                for first_argument in final_events[event](args):
+                    self.finalize(address, method, first_argument)
+
+    def sync_final_events(self, db):
+        # Processes the events of the blocks finalized by the indexer since the previous sync
+        # Only final events are used, an immutability mark is never undone by a reorganization
+        with self.lock:
+            row = db.execute(
+                "SELECT value FROM state WHERE key = 'final_block'"
+            ).fetchone()
+            if row is None or row[0] <= self.final_block:
+                return
+            events = {
+                event
+                for final_events in IMMUTABLE_AFTER.values()
+                for event in final_events
+            }
+            for address, event, args in db.execute(
+                "SELECT cursors.address, events.event, events.args FROM events "
+                "JOIN cursors ON cursors.contract = events.contract "
+                "WHERE events.block_number > ? AND events.block_number <= ? "
+                f"AND events.event IN ({', '.join('?' * len(events))}) "
+                "ORDER BY events.block_number, events.log_index",
+                [self.final_block, row[0]] + sorted(events),
+            ).fetchall():
+                self.process_event(address, event, json.loads(args))
+            self.final_block = row[0]
+
+    def head_block(self):
+        with self.lock:
+            head = self.head
+        if head is None or time.monotonic() - head[1] >= self.head_ttl:
+            head = (web3.eth.block_number, time.monotonic())
+            if self.db is not None:
+                self.sync_final_events(self.db)
+            with self.lock:
+                self.head = head
+        return head[0]
+
+    def is_final(self, address, method, args):
+        return bool(args) and (address, method, args[0]) in self.final
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+    def put(self, key, data):
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = data
+            self.size += len(key[1]) + len(data) + ENTRY_OVERHEAD
+            while self.size > self.byte_budget and self.entries:
+                (_, calldata, _), evicted = self.entries.popitem(last=False)
+                self.size -= len(calldata) + len(evicted) + ENTRY_OVERHEAD
+
+    def invalidate(self, address=None):
+        # Drops the cached results (and immutability marks) of a contract, or of every contract
+        with self.lock:
+            for key in [key for key in self.entries if address in (None, key[0])]:
+                self.size -= len(key[1]) + len(self.entries.pop(key)) + ENTRY_OVERHEAD
+            self.final = {
+                final for final in self.final if address not in (None, final[0])
+            }
+
+    def call(self, method, *args, block_identifier=None):
+        # Same result as method.call(*args, block_identifier=block_identifier)
+        address = method._address
+        calldata = method.encode_input(*args)
+        if block_identifier is None:
+            block_identifier = self.head_block()
+        if self.is_final(address, method._name.split(".")[-1], args):
+            key = (address, calldata, None)
+        else:
+            key = (address, calldata, block_identifier)
+        data = self.get(key)
+        if data is None:
+            data = bytes(
+                web3.eth.call(
+                    {"to": address, "data": calldata},
+                    block_identifier if key[2] is not None else "latest",
+                )
+            )
+            self.put(key, data)
+        return method.decode_output(data)
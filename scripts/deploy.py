@@ -1,6 +1,18 @@
 from web3 import Web3
-from scripts.helpful_scripts import get_account, get_contract, fund_with_link
-from scripts.store_positions_layouts import store_positions, store_layouts
+from scripts.helpful_scripts import (
+    LOCAL_BLOCKCHAIN_ENVIRONMENTS,
+    get_account,
+    get_contract,
+)
+from scripts.manifest import (
+    args_hash,
+    bytecode_hash,
+    load_manifest,
+    manifest_args,
+    manifest_entry,
+    save_manifest,
+)
+from scripts.store_positions_layouts import positions_call, layouts_call
 from brownie import (
     VerifiableRandomFootballer,
     Base64,
@@ -16,88 +28,248 @@ from brownie import (
     ClaimKickToken,
     config,
     network,
+    web3,
 )
 
 
+def deployment_steps():
+    # name => (names of the steps to confirm first, contract container, function of the steps already done)
+    # For a deployment the function returns the constructor arguments, for a transaction
+    # (container None) it returns the contract method and its arguments
+    vrf_coordinator = get_contract("vrf_coordinator")
+    link_token = get_contract("link_token")
+    keyhash = config["networks"][network.show_active()]["keyhash"]
+    fee = config["networks"][network.show_active()]["fee"]
+    return {
+        "base64": ([], Base64, lambda done: []),
+        "svg_lib": ([], SvgLib, lambda done: []),
+        # Libraries are linked when the contracts using them are deployed
+        "metadata_lib": (["svg_lib"], MetadataLib, lambda done: []),
+        "verifiable_random_footballer": (
+            ["base64", "metadata_lib"],
+            VerifiableRandomFootballer,
+            lambda done: [
+                vrf_coordinator,
+                link_token,
+                keyhash,
+                fee,
+                Web3.toWei(0.1, "ether"),
+            ],
+        ),
+        "fund_verifiable_random_footballer": (
+            ["verifiable_random_footballer"],
+            None,
+            lambda done: (
+                link_token.transfer,
+                [done["verifiable_random_footballer"], Web3.toWei(1, "ether")],
+            ),
+        ),
+        "kick_token": ([], KickToken, lambda done: []),
+        "player_loan": (
+            ["kick_token", "verifiable_random_footballer"],
+            PlayerLoan,
+            lambda done: [done["kick_token"], done["verifiable_random_footballer"]],
+        ),
+        "player_transfer": (
+            ["kick_token", "verifiable_random_footballer"],
+            PlayerTransfer,
+            lambda done: [done["kick_token"], done["verifiable_random_footballer"]],
+        ),
+        "league_team": (
+            ["kick_token", "verifiable_random_footballer", "player_loan"],
+            LeagueTeam,
+            lambda done: [
+                done["kick_token"],
+                done["verifiable_random_footballer"],
+                done["player_loan"],
+                Web3.toWei(10, "ether"),
+                Web3.toWei(5, "ether"),
+            ],
+        ),
+        "league_game": (
+            [
+                "kick_token",
+                "league_team",
+                "verifiable_random_footballer",
+                "player_loan",
+            ],
+            LeagueGame,
+            lambda done: [
+                done["kick_token"],
+                done["league_team"],
+                done["verifiable_random_footballer"],
+                done["player_loan"],
+                vrf_coordinator,
+                link_token,
+                keyhash,
+                fee,
+            ],
+        ),
+        "fund_league_game": (
+            ["league_game"],
+            None,
+            lambda done: (
+                link_token.transfer,
+                [done["league_game"], Web3.toWei(1, "ether")],
+            ),
+        ),
+        "player_rate": (
+            [
+                "league_game",
+                "league_team",
+                "verifiable_random_footballer",
+                "player_loan",
+            ],
+            PlayerRate,
+            lambda done: [
+                done["league_game"],
+                done["league_team"],
+                done["verifiable_random_footballer"],
+                done["player_loan"],
+            ],
+        ),
+        "store_positions": (
+            ["player_rate"],
+            None,
+            lambda done: positions_call(done["player_rate"]),
+        ),
+        "store_layouts": (
+            ["player_rate"],
+            None,
+            lambda done: layouts_call(done["player_rate"]),
+        ),
+        "game_result": (
+            ["player_rate", "league_game"],
+            GameResult,
+            lambda done: [done["player_rate"], done["league_game"]],
+        ),
+        "set_game_result_contract": (
+            ["league_game", "game_result"],
+            None,
+            lambda done: (
+                done["league_game"].setGameResultContract,
+                [done["game_result"]],
+            ),
+        ),
+        "claim_kick_token": (
+            ["kick_token", "verifiable_random_footballer"],
+            ClaimKickToken,
+            lambda done: [done["kick_token"], done["verifiable_random_footballer"]],
+        ),
+        "transfer_kick": (
+            ["kick_token", "claim_kick_token"],
+            None,
+            lambda done: (
+                done["kick_token"].transfer,
+                [done["claim_kick_token"], Web3.toWei(10000 * 100, "ether")],
+            ),
+        ),
+    }
+
+
+def step_id(value):
+    # Address of a deployed contract, hash of the transaction of a step
+    return getattr(value, "address", None) or getattr(value, "txid", value)
+
+
+def is_reusable(entry, step, done):
+    # A manifest entry is reused while the bytecode, the constructor arguments and the dependencies are unchanged
+    # A transaction is sent again when its arguments change, like the positions or layouts files
+    dependencies, container, function = step
+    if entry is None or entry["dependencies"] != {
+        dependency: step_id(done[dependency]) for dependency in dependencies
+    }:
+        return False
+    if container is None:
+        return entry.get("args_hash") == args_hash(function(done)[1])
+    return (
+        entry["bytecode_hash"] == bytecode_hash(container)
+        and entry["args"] == manifest_args(function(done))
+        and len(web3.eth.get_code(entry["address"])) > 0
+    )
+
+
+def run_steps(steps, account, manifest=None, manifest_path=None):
+    # Sends every step whose dependencies are confirmed, with consecutive nonces and without waiting,
+    # then waits for the oldest pending transaction, until all the steps are confirmed
+    # The duration is the critical path of the dependency graph instead of the sum of the steps
+    # The steps recorded in the manifest and still valid are reused instead of sent again
+    done = {}
+    pending = {}
+    nonce = web3.eth.get_transaction_count(account.address, "pending")
+    while len(done) < len(steps):
+        ready = [
+            name
+            for name, (dependencies, _, _) in steps.items()
+            if name not in done
+            and name not in pending
+            and all(dependency in done for dependency in dependencies)
+        ]
+        for name in ready:
+            dependencies, container, function = steps[name]
+            entry = manifest.get(name) if manifest is not None else None
+            if is_reusable(entry, steps[name], done):
+                done[name] = (
+                    container.at(entry["address"])
+                    if container
+                    else entry["transaction"]
+                )
+                continue
+            params = {"from": account, "nonce": nonce, "required_confs": 0}
+            if container:
+                pending[name] = container.deploy(*function(done), params)
+            else:
+                method, args = function(done)
+                pending[name] = method(*args, params)
+            nonce += 1
+        if ready and not pending:
+            # Only reused steps, their dependents may be ready now
+            continue
+        if not pending:
+            raise ValueError(f"Circular dependencies in {set(steps) - set(done)}")
+        # Transactions of the same account are mined in nonce order
+        name = min(pending, key=lambda pending_name: pending[pending_name].nonce)
+        tx = pending.pop(name)
+        tx.wait(1)
+        if tx.status != 1:
+            raise RuntimeError(f"{name} failed : {tx.txid}")
+        dependencies, container, function = steps[name]
+        done[name] = container.at(tx.contract_address, account, tx) if container else tx
+        if manifest is not None:
+            # Saved after every step, an interrupted deployment resumes where it stopped
+            manifest[name] = manifest_entry(
+                tx,
+                {dependency: step_id(done[dependency]) for dependency in dependencies},
+                container,
+                function(done) if container else function(done)[1],
+            )
+            save_manifest(manifest, manifest_path)
+    return done
+
+
 def deploy():
     print("Deploying contracts...")
     account = get_account()
-    Base64.deploy({"from": account})
-    SvgLib.deploy({"from": account})
-    MetadataLib.deploy({"from": account})
-    verifiable_random_footballer = VerifiableRandomFootballer.deploy(
-        get_contract("vrf_coordinator"),
-        get_contract("link_token"),
-        config["networks"][network.show_active()]["keyhash"],
-        config["networks"][network.show_active()]["fee"],
-        Web3.toWei(0.1, "ether"),
-        {"from": account},
-    )
-    fund_with_link(
-        verifiable_random_footballer.address, account, None, Web3.toWei(1, "ether")
-    )
-    kick_token = KickToken.deploy({"from": account})
-    player_loan = PlayerLoan.deploy(
-        kick_token.address, verifiable_random_footballer.address, {"from": account}
-    )
-    player_transfer = PlayerTransfer.deploy(
-        kick_token.address, verifiable_random_footballer.address, {"from": account}
-    )
-    league_team = LeagueTeam.deploy(
-        kick_token.address,
-        verifiable_random_footballer.address,
-        player_loan.address,
-        Web3.toWei(10, "ether"),
-        Web3.toWei(5, "ether"),
-        {"from": account},
-    )
-    league_game = LeagueGame.deploy(
-        kick_token.address,
-        league_team.address,
-        verifiable_random_footballer.address,
-        player_loan.address,
-        get_contract("vrf_coordinator"),
-        get_contract("link_token"),
-        config["networks"][network.show_active()]["keyhash"],
-        config["networks"][network.show_active()]["fee"],
-        {"from": account},
-    )
-    fund_with_link(league_game.address, account, None, Web3.toWei(1, "ether"))
-    player_rate = PlayerRate.deploy(
-        league_game.address,
-        league_team.address,
-        verifiable_random_footballer.address,
-        player_loan.address,
-        {"from": account},
-    )
-    store_positions(player_rate.address)
-    store_layouts(player_rate.address)
-    game_result = GameResult.deploy(
-        player_rate.address, league_game.address, {"from": account}
-    )
-    set_contract_address_tx = league_game.setGameResultContract(
-        game_result.address, {"from": account}
-    )
-    set_contract_address_tx.wait(1)
-    claim_kick_token = ClaimKickToken.deploy(
-        kick_token.address, verifiable_random_footballer.address, {"from": account}
-    )
-    transfer_kick = kick_token.transfer(
-        claim_kick_token, Web3.toWei(10000 * 100, "ether"), {"from": account}
+    get_contract("multicall")  # deployed with the mocks on local networks
+    # Local chains are deployed from scratch every time
+    manifest = (
+        None
+        if network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS
+        else load_manifest()
     )
-    transfer_kick.wait(1)
+    done = run_steps(deployment_steps(), account, manifest)
     print("Contracts deployed")
 
     return (
-        verifiable_random_footballer,
-        kick_token,
-        player_transfer,
-        player_loan,
-        league_team,
-        league_game,
-        player_rate,
-        game_result,
-        claim_kick_token,
+        done["verifiable_random_footballer"],
+        done["kick_token"],
+        done["player_transfer"],
+        done["player_loan"],
+        done["league_team"],
+        done["league_game"],
+        done["player_rate"],
+        done["game_result"],
+        done["claim_kick_token"],
     )
 
 
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from brownie import VerifiableRandomFootballer, network
+from scripts.footballer_metadata import attributes_chunk
+
+MAX_SUPPLY = 10000
+ATTRIBUTES_PATH = "./build/footballer_attributes.npy"
+
+
+def build_attributes_table(seeds, max_workers=None, chunk_size=250, mp_context=None):
+    # seeds: {tokenId: randomNumber}, returns a (MAX_SUPPLY x 6) uint8 table indexed by token id
+    # The workers only import scripts.footballer_metadata, any start method works
+    table = np.zeros((MAX_SUPPLY, 6), dtype=np.uint8)
+    token_ids = sorted(seeds)
+    chunks = [
+        token_ids[i : i + chunk_size] for i in range(0, len(token_ids), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context
+    ) as executor:
+        results = executor.map(
+            attributes_chunk,
+            [[seeds[token_id] for token_id in chunk] for chunk in chunks],
+        )
+        for chunk, attributes in zip(chunks, results):
+            table[chunk] = attributes
+    return table
+
+
+def fetch_seeds(verifiable_random_footballer, from_block=0):
+    # Random numbers emitted with PlayerWithRandomness, tokenIdToRandomNumber is internal
+    events = verifiable_random_footballer.events.get_sequence(
+        from_block, event_type="PlayerWithRandomness"
+    )
+    return {event.args.tokenId: event.args.randomNumber for event in events}
+
+
+def save_attributes(table, path=ATTRIBUTES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+
+
+def load_attributes(path=ATTRIBUTES_PATH):
+    # Memory mapped, the file is only read when rows are accessed
+    return np.load(path, mmap_mode="r")
+
+
+def main():
+    verifiable_random_footballer = VerifiableRandomFootballer[-1]
+    seeds = fetch_seeds(verifiable_random_footballer)
+    print(
+        f"Generating attributes of {len(seeds)} players on {network.show_active()}..."
+    )
+    save_attributes(build_attributes_table(seeds))
+    print(f"Attributes stored in {ATTRIBUTES_PATH}")
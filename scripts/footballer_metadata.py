@@ -0,0 +1,59 @@
+from web3 import Web3
+
+# Port of the attributes generation of VerifiableRandomFootballer and MetadataLib
+# Kept free of brownie imports, the processes of build_attributes_table import it outside a project
+
+
+def _uint8(value):
+    return value & 0xFF
+
+
+def _keccak_uint(value, index):
+    # uint256(keccak256(abi.encode(value, index)))
+    return int.from_bytes(
+        Web3.keccak(value.to_bytes(32, "big") + index.to_bytes(32, "big")), "big"
+    )
+
+
+def expand(random_number, n=15):
+    # Port of VerifiableRandomFootballer.expand
+    return [_keccak_uint(random_number, i) for i in range(n)]
+
+
+def generates_attributes(random_values):
+    # Port of the uintAttributes part of MetadataLib.generatesMetadata
+    # keeps the uint8 wrapping of the UnsafeMath8 operations
+    attributes = [0] * 6
+    position_line = random_values[0] % 11
+    if position_line < 10:
+        position_side = random_values[1] % 10
+        compatible_positions = random_values[2] % 4
+    else:
+        position_side = 10  # no side for GK
+        compatible_positions = 0  # no compatible positions for GK
+    attributes[0] = _uint8(position_line * 10 + position_side)
+
+    for i in range(compatible_positions):
+        compatible_hash = _keccak_uint(random_values[3], i)
+        attributes[i + 1] = _uint8((compatible_hash % 4) * 10 + compatible_hash % 3)
+
+    # GK is the most defensive player, the increment of the other lines is never called in the library
+    if position_line == 10:
+        position_line = 0
+
+    defense_score = (random_values[4] % 100) + 1
+    attack_score = (random_values[5] % 100) + 1
+    line_score = _uint8(position_line * 10)
+    if defense_score > line_score // 3:
+        attributes[4] = _uint8(defense_score - line_score // 3) // 10
+    if attack_score > _uint8(100 - line_score) // 3:
+        attributes[5] = _uint8(attack_score - line_score // 3) // 10
+    return attributes
+
+
+def attributes_from_seed(random_number):
+    return generates_attributes(expand(random_number))
+
+
+def attributes_chunk(random_numbers):
+    return [attributes_from_seed(random_number) for random_number in random_numbers]
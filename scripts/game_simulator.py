@@ -0,0 +1,69 @@
+import numpy as np
+from scripts.player_rates import HOME_PLAYERS, AWAY_PLAYERS, player_rates
+
+DECIMALS = 10**18  # fixed point used by GameResult.teamAvgRates
+MIN_PLAYERS = 8  # the average is calculated on at least 8 players
+INDIVIDUAL_GOAL_MARGIN = 3
+COLLECTIVE_GOAL_MARGIN = 1
+COLLECTIVE_GOAL_PLAYERS = 3
+
+
+def _team_totals(player_ids, defense_rates, attack_rates):
+    # Sums and player counts used by GameResult.teamAvgRates, as (games x 2) arrays for home and away teams
+    # The away loop of teamAvgRates reads the fourth field of gamePlayers, which is the attack rate
+    player_ids = np.asarray(player_ids)
+    home_signed = player_ids[:, HOME_PLAYERS] > 0
+    away_signed = player_ids[:, AWAY_PLAYERS] > 0
+    sums = np.stack(
+        (
+            np.where(home_signed, defense_rates[:, HOME_PLAYERS], 0).sum(axis=1),
+            np.where(away_signed, attack_rates[:, AWAY_PLAYERS], 0).sum(axis=1),
+        ),
+        axis=1,
+    ).astype(np.int64)
+    players = np.stack((home_signed.sum(axis=1), away_signed.sum(axis=1)), axis=1)
+    return sums, players
+
+
+def team_avg_rates(player_ids, defense_rates, attack_rates):
+    # Port of GameResult.teamAvgRates, returns the exact 18 decimals averages as a (games x 2) array of ints
+    sums, players = _team_totals(
+        player_ids, np.asarray(defense_rates), np.asarray(attack_rates)
+    )
+    averages = sums.astype(object) * DECIMALS // np.maximum(players, MIN_PLAYERS)
+    return np.where(players > 0, averages, 0)
+
+
+def _goals(attack_rates, defense_sum):
+    # Port of GameResult.scoreGoals for one side
+    # attackRate > defenseAvg + margin with defenseAvg = sum * 10**18 / players rounded down
+    # is equivalent to sum * 10**18 < (attackRate - margin) * players, and (attackRate - margin) * players
+    # is always below 10**18 for uint8 rates, so only a team facing a zero defense sum can score
+    open_defense = (defense_sum == 0)[:, None]
+    attack_rates = attack_rates.astype(np.int64)
+    individual = open_defense & (attack_rates > INDIVIDUAL_GOAL_MARGIN)
+    collective = open_defense & ~individual & (attack_rates > COLLECTIVE_GOAL_MARGIN)
+    return individual.sum(axis=1) + collective.sum(axis=1) // COLLECTIVE_GOAL_PLAYERS
+
+
+def score_goals(player_ids, defense_rates, attack_rates):
+    # Home goals, away goals and GameResult.setResult code (1 = home wins, 2 = away wins, 3 = draw)
+    # player_ids, defense_rates, attack_rates: (games x 32) arrays indexed like PlayerRate.gamePlayers
+    attack_rates = np.asarray(attack_rates)
+    sums, _ = _team_totals(player_ids, np.asarray(defense_rates), attack_rates)
+    home_goals = _goals(attack_rates[:, HOME_PLAYERS], sums[:, 1])
+    away_goals = _goals(attack_rates[:, AWAY_PLAYERS], sums[:, 0])
+    results = np.where(
+        home_goals > away_goals, 1, np.where(home_goals < away_goals, 2, 3)
+    )
+    return (
+        home_goals.astype(np.uint8),
+        away_goals.astype(np.uint8),
+        results.astype(np.uint8),
+    )
+
+
+def simulate_games(player_ids, *args, **kwargs):
+    # Rates then goals for a batch of games, takes the same arguments as player_rates
+    _, defense_rates, attack_rates = player_rates(player_ids, *args, **kwargs)
+    return score_goals(player_ids, defense_rates, attack_rates)
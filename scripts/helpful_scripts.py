@@ -2,23 +2,35 @@ from brownie import (
     network,
     config,
     accounts,
+    chain,
     web3,
     Contract,
     VRFCoordinatorMock,
     LinkToken,
+    Multicall,
 )
-import time
+import asyncio
+from eth_utils import event_abi_to_log_topic
 
 
 FORKED_LOCAL_ENVIRONMENTS = ["mainnet-fork", "mainnet-fork-dev"]
-LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["development", "ganache-local"]
+LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["development", "ganache-local", "anvil"]
 POLYGON_TESTNET = ["polygon-test", "mumbai"]
 OPENSEA_URL = "https://testnets.opensea.io/assets/{}/{}"
 DECIMALS = 18
+# Seconds between two Polygon blocks, the contracts count durations in blocks
+BLOCK_TIME = 2
+# clientVersion prefix => RPC method mining a number of blocks in a single request
+MINE_METHODS = {
+    "anvil": lambda blocks: ("anvil_mine", [hex(blocks)]),
+    "hardhatnetwork": lambda blocks: ("hardhat_mine", [hex(blocks)]),
+    "ganache/v7": lambda blocks: ("evm_mine", [{"blocks": blocks}]),
+}
 
 contract_to_mock = {
     "vrf_coordinator": VRFCoordinatorMock,
     "link_token": LinkToken,
+    "multicall": Multicall,
 }
 
 
@@ -55,6 +67,7 @@ def deploy_mocks():
     account = get_account()
     link_token = LinkToken.deploy({"from": account})
     VRFCoordinatorMock.deploy(link_token.address, {"from": account})
+    Multicall.deploy({"from": account})
     print("Mocks deployed")
 
 
@@ -69,19 +82,144 @@ def fund_with_link(
     return tx
 
 
-def listen_for_event(brownie_contract, event, timeout=200, poll_interval=2):
+def mine_blocks(blocks, block_time=BLOCK_TIME):
+    # Moves the local chain blocks ahead and its time blocks * block_time seconds ahead
+    # The blocks are mined in a single request when the node supports it, one by one otherwise
+    if blocks <= 0:
+        return web3.eth.block_number
+    chain.sleep(blocks * block_time)
+    client = web3.clientVersion.lower()
+    mine_method = next(
+        (
+            method
+            for prefix, method in MINE_METHODS.items()
+            if client.startswith(prefix)
+        ),
+        None,
+    )
+    if mine_method is None:
+        chain.mine(blocks)
+    else:
+        response = web3.provider.make_request(*mine_method(blocks))
+        if "error" in response:
+            raise RuntimeError(f"Blocks not mined : {response['error']['message']}")
+    return web3.eth.block_number
+
+
+def event_decoders(brownie_contract):
+    # topic0 => web3 event used to decode the logs of the contract
     web3_contract = web3.eth.contract(
         address=brownie_contract.address, abi=brownie_contract.abi
     )
-    start_time = time.time()
-    current_time = time.time()
-    event_filter = web3_contract.events[event].createFilter(fromBlock="latest")
-    while current_time - start_time < timeout:
-        for event_response in event_filter.get_new_entries():
-            if event in event_response.event:
-                print("Found event!")
-                return event_response
-        time.sleep(poll_interval)
-        current_time = time.time()
-    print("Timeout reached, no event found.")
-    return {"event": None}
+    return {
+        event_abi_to_log_topic(abi): web3_contract.events[abi["name"]]()
+        for abi in brownie_contract.abi
+        if abi["type"] == "event"
+    }
+
+
+class EventWaiter:
+    # Waits on many (contract, event, filters) at once with a single eth_getLogs poll loop
+    # A node error is retried at the next poll, after max_errors errors in a row it fails the waiters
+    def __init__(self, poll_interval=2, max_errors=5):
+        self.poll_interval = poll_interval
+        self.max_errors = max_errors
+        self.decoders = {}  # contract address => topic0 => web3 event
+        self.pending = []  # (contract address, event name, args filters, future)
+        self.next_block = None
+        self.task = None
+
+    def wait(self, brownie_contract, event, filters=None, from_block=None):
+        # Future resolved with the first matching event mined after the call, or from from_block
+        # A new poll loop starts after the latest block, the blocks mined while no loop was
+        # running are not scanned
+        loop = asyncio.get_running_loop()
+        address = brownie_contract.address
+        if address not in self.decoders:
+            self.decoders[address] = event_decoders(brownie_contract)
+        if self.task is None or self.task.done():
+            self.next_block = web3.eth.block_number + 1
+            self.task = loop.create_task(self.poll())
+        if from_block is not None:
+            self.next_block = min(self.next_block, from_block)
+        future = loop.create_future()
+        self.pending.append((address, event, filters if filters else {}, future))
+        return future
+
+    def dispatch(self, log):
+        decoders = self.decoders.get(log["address"], {})
+        if not log["topics"] or bytes(log["topics"][0]) not in decoders:
+            return
+        event_response = decoders[bytes(log["topics"][0])].processLog(log)
+        for address, event, filters, future in self.pending:
+            if (
+                not future.done()
+                and address == log["address"]
+                and event == event_response.event
+                and all(
+                    event_response.args.get(arg) == value
+                    for arg, value in filters.items()
+                )
+            ):
+                future.set_result(event_response)
+
+    async def poll(self):
+        loop = asyncio.get_running_loop()
+        errors = 0
+        while self.pending:
+            try:
+                latest = await loop.run_in_executor(None, lambda: web3.eth.block_number)
+                if latest >= self.next_block:
+                    logs = await loop.run_in_executor(
+                        None,
+                        web3.eth.get_logs,
+                        {
+                            "address": list({waiter[0] for waiter in self.pending}),
+                            "fromBlock": self.next_block,
+                            "toBlock": latest,
+                        },
+                    )
+                    self.next_block = latest + 1
+                    for log in logs:
+                        self.dispatch(log)
+                errors = 0
+            except Exception as error:
+                errors += 1
+                if errors >= self.max_errors:
+                    # The callers get the node error instead of a timeout
+                    for waiter in self.pending:
+                        if not waiter[3].done():
+                            waiter[3].set_exception(error)
+                    self.pending = []
+                    return
+                print(f"Polling events failed ({errors}/{self.max_errors}) : {error}")
+            # Resolved, cancelled and timed out waiters leave the loop
+            self.pending = [waiter for waiter in self.pending if not waiter[3].done()]
+            if self.pending:
+                await asyncio.sleep(self.poll_interval)
+
+
+async def wait_for_events(requests, timeout=200, poll_interval=2):
+    # requests: list of (brownie contract, event name, args filters or None)
+    # Returns the event responses in the same order, None for the events not found before timeout
+    # Raises the node error when the events could not be polled
+    waiter = EventWaiter(poll_interval)
+    futures = [
+        waiter.wait(brownie_contract, event, filters)
+        for brownie_contract, event, filters in requests
+    ]
+    done, not_done = await asyncio.wait(futures, timeout=timeout)
+    for future in not_done:
+        future.cancel()
+    return [future.result() if future in done else None for future in futures]
+
+
+def listen_for_event(brownie_contract, event, timeout=200, poll_interval=2):
+    event_response = asyncio.run(
+        wait_for_events([(brownie_contract, event, None)], timeout, poll_interval)
+    )[0]
+    if event_response is None:
+        print("Timeout reached, no event found.")
+        return {"event": None}
+    print("Found event!")
+    return event_response
@@ -0,0 +1,316 @@
+import json
+import os
+import sqlite3
+import time
+from brownie import (
+    VerifiableRandomFootballer,
+    LeagueTeam,
+    LeagueGame,
+    PlayerRate,
+    PlayerLoan,
+    PlayerTransfer,
+    ClaimKickToken,
+    web3,
+)
+from web3.exceptions import BlockNotFound
+from scripts.helpful_scripts import event_decoders
+from scripts.log_fetcher import fetch_many
+
+DATABASE_PATH = "./build/league_events.db"
+INDEXED_CONTRACTS = [
+    VerifiableRandomFootballer,
+    LeagueTeam,
+    LeagueGame,
+    PlayerRate,
+    PlayerLoan,
+    PlayerTransfer,
+    ClaimKickToken,
+]
+
+CONFIRMATIONS = 128  # Depth after which a block can not be reorganized anymore
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    contract TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    block_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    contract TEXT NOT NULL,
+    event TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (transaction_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (contract, event, block_number);
+CREATE INDEX IF NOT EXISTS events_by_block ON events (block_number);
+CREATE TABLE IF NOT EXISTS blocks (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE VIEW IF NOT EXISTS final_events AS
+    SELECT events.* FROM events, state
+    WHERE state.key = 'final_block' AND events.block_number <= state.value;
+"""
+# (contract, event) => functions (db, address, event row) updating the derived tables
+EVENT_HANDLERS = {}
+# Functions (db, fork_block) removing the rows derived from the events of the reorganized blocks
+ROLLBACK_HOOKS = []
+# Handler => function (db, address, event row, rows stored along) reading the chain for it
+# The reads are done before the write transaction, the handler gets their result as 4th argument
+EVENT_READERS = {}
+
+
+def connect(path=DATABASE_PATH, check_same_thread=True):
+    # check_same_thread=False lets several threads share the connection, the caller serializes them
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=check_same_thread)
+    if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # The database only caches the chain, an outdated one is indexed again
+        for table in ["events", "cursors"]:
+            db.execute(f"DROP TABLE IF EXISTS {table}")
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+
+def get_cursor(db, name, address, start_block=0):
+    # Last indexed block of a contract, a new address starts over from start_block
+    row = db.execute(
+        "SELECT address, block_number FROM cursors WHERE contract = ?", (name,)
+    ).fetchone()
+    if row is None or row[0] != address:
+        return start_block - 1
+    return row[1]
+
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def decode_logs(decoders, name, logs):
+    rows = []
+    for log in logs:
+        if not log["topics"] or bytes(log["topics"][0]) not in decoders:
+            continue
+        event = decoders[bytes(log["topics"][0])].processLog(log)
+        rows.append(
+            (
+                name,
+                event.event,
+                event.blockNumber,
+                event.blockHash.hex(),
+                event.transactionHash.hex(),
+                event.logIndex,
+                json.dumps(
+                    {key: _json_value(value) for key, value in event.args.items()}
+                ),
+            )
+        )
+    return rows
+
+
+def get_final_block(db):
+    row = db.execute("SELECT value FROM state WHERE key = 'final_block'").fetchone()
+    return row[0] if row else -1
+
+
+def _read_chain(db, address, rows, handlers, pending_rows):
+    # Results of the readers of the handlers of rows, keyed on (transaction hash, log index, handler)
+    read = {}
+    for row in rows:
+        readers = [
+            handler for handler in handlers.get(row[1], []) if handler in EVENT_READERS
+        ]
+        if (
+            readers
+            and not db.execute(
+                "SELECT 1 FROM events WHERE transaction_hash = ? AND log_index = ?",
+                (row[4], row[5]),
+            ).fetchone()
+        ):
+            for handler in readers:
+                read[(row[4], row[5], handler)] = EVENT_READERS[handler](
+                    db, address, row, pending_rows
+                )
+    return read
+
+
+def _handle(db, address, row, handler, read):
+    if handler in EVENT_READERS:
+        handler(db, address, row, read[(row[4], row[5], handler)])
+    else:
+        handler(db, address, row)
+
+
+def store_events(db, name, address, rows, block_number, block_hash=None):
+    # Events, block hashes and cursor are saved in the same transaction so a restart never skips or duplicates a range
+    # The handlers of the derived tables are called once per new event, in the same transaction
+    handlers = {
+        event: functions
+        for (contract, event), functions in EVENT_HANDLERS.items()
+        if contract == name
+    }
+    read = _read_chain(db, address, rows, handlers, rows)
+    with db:
+        for row in rows:
+            inserted = db.execute(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", row
+            ).rowcount
+            if inserted:
+                for handler in handlers.get(row[1], []):
+                    _handle(db, address, row, handler, read)
+        db.executemany(
+            "INSERT OR REPLACE INTO blocks VALUES (?, ?)",
+            {(row[2], row[3]) for row in rows},
+        )
+        if block_hash:
+            db.execute(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?)",
+                (block_number, block_hash),
+            )
+        db.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)",
+            (name, address, block_number),
+        )
+
+
+def register_derived_table(db, table, schema, handlers, rollback_hook, readers=None):
+    # Adds a table maintained from the indexed events, handlers: (contract, event) => function
+    # readers: handler => function reading the chain for it, see EVENT_READERS
+    # An empty table is filled from the events already indexed
+    db.executescript(schema)
+    for key, handler in handlers.items():
+        if handler not in EVENT_HANDLERS.setdefault(key, []):
+            EVENT_HANDLERS[key].append(handler)
+    EVENT_READERS.update(readers or {})
+    if rollback_hook not in ROLLBACK_HOOKS:
+        ROLLBACK_HOOKS.append(rollback_hook)
+    if db.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+        return
+    addresses = dict(db.execute("SELECT contract, address FROM cursors"))
+    rows = db.execute(
+        "SELECT * FROM events WHERE "
+        + " OR ".join(["(contract = ? AND event = ?)"] * len(handlers))
+        + " ORDER BY block_number, log_index",
+        [value for key in handlers for value in key],
+    ).fetchall()
+    # The chain reads of all the events are done before the write transaction
+    read = {}
+    for row in rows:
+        handler = handlers[(row[0], row[1])]
+        if handler in EVENT_READERS:
+            read[(row[4], row[5], handler)] = EVENT_READERS[handler](
+                db, addresses[row[0]], row, []
+            )
+    with db:
+        for row in rows:
+            _handle(db, addresses[row[0]], row, handlers[(row[0], row[1])], read)
+
+
+def find_fork_block(db):
+    # First block that may have been reorganized, None when the indexed blocks are still in the chain
+    # The recorded hashes above the final block are checked from the most recent one,
+    # a reorganization replaces the end of the chain so the first matching block ends the search
+    # The blocks between it and the first mismatch were not recorded and may hold new events too
+    final_block = get_final_block(db)
+    fork_block = None
+    for block_number, block_hash in db.execute(
+        "SELECT block_number, block_hash FROM blocks WHERE block_number > ? "
+        "ORDER BY block_number DESC",
+        (final_block,),
+    ).fetchall():
+        try:
+            block = web3.eth.get_block(block_number)
+        except BlockNotFound:
+            # The new chain is shorter than the indexed one
+            block = None
+        if block is not None and block.hash.hex() == block_hash:
+            return block_number + 1 if fork_block is not None else None
+        fork_block = block_number
+    return final_block + 1 if fork_block is not None else None
+
+
+def rollback(db, fork_block):
+    # Removes everything indexed from fork_block, the next run fetches these blocks again
+    with db:
+        db.execute("DELETE FROM events WHERE block_number >= ?", (fork_block,))
+        db.execute("DELETE FROM blocks WHERE block_number >= ?", (fork_block,))
+        db.execute(
+            "UPDATE cursors SET block_number = ? WHERE block_number >= ?",
+            (fork_block - 1, fork_block),
+        )
+        for rollback_hook in ROLLBACK_HOOKS:
+            rollback_hook(db, fork_block)
+
+
+def finalize(db, final_block):
+    # Blocks below the confirmation depth are final, their hashes are not needed anymore
+    with db:
+        db.execute(
+            "INSERT OR REPLACE INTO state VALUES ('final_block', ?)", (final_block,)
+        )
+        db.execute("DELETE FROM blocks WHERE block_number < ?", (final_block,))
+
+
+def index_events(
+    db, contracts=None, start_block=0, max_workers=4, confirmations=CONFIRMATIONS
+):
+    # Indexes the new events of the league contracts up to the latest block
+    # after rolling back the blocks that have been reorganized since the previous run
+    # The contracts are fetched in parallel, the events are stored from this thread
+    contracts = (
+        contracts if contracts else [container[-1] for container in INDEXED_CONTRACTS]
+    )
+    fork_block = find_fork_block(db)
+    if fork_block is not None:
+        print(f"Chain reorganization from block {fork_block}, rolling back")
+        rollback(db, fork_block)
+    to_block = web3.eth.block_number
+    final_block = max(to_block - confirmations, get_final_block(db))
+    by_address = {
+        contract.address: (contract._name, event_decoders(contract))
+        for contract in contracts
+    }
+    ranges = [
+        (address, get_cursor(db, name, address, start_block) + 1, to_block)
+        for address, (name, _) in by_address.items()
+    ]
+    indexed = {name: 0 for name, _ in by_address.values()}
+    for address, block_number, logs in fetch_many(ranges, max_workers):
+        name, decoders = by_address[address]
+        rows = decode_logs(decoders, name, logs)
+        # The hash of the last block of a range that is not final yet is needed to detect
+        # a reorganization that removes events from a range that had none
+        block_hash = None
+        if block_number > final_block:
+            block_hash = web3.eth.get_block(block_number).hash.hex()
+        store_events(db, name, address, rows, block_number, block_hash)
+        indexed[name] += len(rows)
+    finalize(db, final_block)
+    return indexed
+
+
+def main(poll_interval=15):
+    from scripts import appearances, leaderboard
+
+    db = connect()
+    leaderboard.register(db)
+    appearances.register(db)
+    while True:
+        for name, indexed in index_events(db).items():
+            if indexed:
+                print(f"{name} : {indexed} new events")
+        time.sleep(poll_interval)
@@ -0,0 +1,229 @@
+import json
+import numpy as np
+from brownie import LeagueGame, PlayerRate, web3
+from eth_utils import event_signature_to_log_topic
+from scripts.game_simulator import score_goals
+from scripts.indexer import connect, register_derived_table
+
+TRANSFER_TOPIC = event_signature_to_log_topic("Transfer(address,address,uint256)")
+# Version of the tables below, older tables are filled again from the indexed events
+# 2: the KICK won does not count the stake given back
+TABLES_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_results (
+    game_id INTEGER PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    home_team INTEGER NOT NULL,
+    away_team INTEGER NOT NULL,
+    home_goals INTEGER NOT NULL,
+    away_goals INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    home_kick TEXT NOT NULL,
+    away_kick TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS game_results_by_block ON game_results (block_number);
+CREATE TABLE IF NOT EXISTS standings (
+    team_id INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    goals_for INTEGER NOT NULL,
+    goals_against INTEGER NOT NULL,
+    kick_won TEXT NOT NULL
+);
+"""
+
+
+def kick_transfers(league_game, transaction_hash, incoming=False):
+    # KICK tokens transferred by the LeagueGame contract in a transaction, or to it with incoming,
+    # read from the receipt of the transaction
+    kick_token = league_game.kickToken()
+    topic = 2 if incoming else 1
+    address = "0x" + league_game.address[2:].lower().rjust(64, "0")
+    amount = 0
+    for log in web3.eth.get_transaction_receipt(transaction_hash)["logs"]:
+        if (
+            log["address"] == kick_token
+            and bytes(log["topics"][0]) == TRANSFER_TOPIC
+            and log["topics"][topic].hex() == address
+        ):
+            amount += int(log["data"], 16)
+    return amount
+
+
+def sign_up_transaction(db, team_id, row, pending_rows):
+    # Transaction of the last teamSignedUp of the team before the gameFinished event row,
+    # among the stored events and the ones stored along with row
+    sign_ups = db.execute(
+        "SELECT block_number, log_index, transaction_hash FROM events "
+        "WHERE contract = 'LeagueGame' AND event = 'teamSignedUp' "
+        "AND json_extract(args, '$.teamId') = ?",
+        (team_id,),
+    ).fetchall()
+    sign_ups += [
+        (pending[2], pending[5], pending[4])
+        for pending in pending_rows
+        if pending[1] == "teamSignedUp" and json.loads(pending[6])["teamId"] == team_id
+    ]
+    sign_ups = [sign_up for sign_up in sign_ups if sign_up[:2] < (row[2], row[5])]
+    return max(sign_ups)[2] if sign_ups else None
+
+
+def game_goals(player_rate, game_id):
+    # Goals recalculated from the rates set by the settlement, which are not modified afterwards
+    game_players = np.array(player_rate.getGamePlayers(game_id), dtype=np.uint64)
+    home_goals, away_goals, _ = score_goals(
+        game_players[None, :, 0], game_players[None, :, 2], game_players[None, :, 3]
+    )
+    return int(home_goals[0]), int(away_goals[0])
+
+
+def update_standings(db, team_id, sign, goals_for, goals_against, result, kick):
+    # result: 1 = win, 2 = loss, 3 = draw, sign = -1 removes a game
+    db.execute(
+        "INSERT OR IGNORE INTO standings VALUES (?, 0, 0, 0, 0, 0, 0, '0')", (team_id,)
+    )
+    (kick_won,) = db.execute(
+        "SELECT kick_won FROM standings WHERE team_id = ?", (team_id,)
+    ).fetchone()
+    # KICK amounts are 18 decimals integers, larger than sqlite integers
+    db.execute(
+        "UPDATE standings SET games = games + ?, wins = wins + ?, draws = draws + ?, "
+        "losses = losses + ?, goals_for = goals_for + ?, goals_against = goals_against + ?, "
+        "kick_won = ? WHERE team_id = ?",
+        (
+            sign,
+            sign * (result == 1),
+            sign * (result == 3),
+            sign * (result == 2),
+            sign * goals_for,
+            sign * goals_against,
+            str(int(kick_won) + sign * kick),
+            team_id,
+        ),
+    )
+
+
+def apply_game(db, game, sign):
+    home_team, away_team, home_goals, away_goals, result, home_kick, away_kick = game[
+        2:
+    ]
+    # A game without calculated rates has a 0 result and is paid as a draw
+    home_result = result if result in [1, 2] else 3
+    away_result = {1: 2, 2: 1}.get(result, 3)
+    update_standings(
+        db, home_team, sign, home_goals, away_goals, home_result, int(home_kick)
+    )
+    update_standings(
+        db, away_team, sign, away_goals, home_goals, away_result, int(away_kick)
+    )
+
+
+def read_game_finished(db, address, row, pending_rows):
+    # Chain reads of on_game_finished, only from the latest state and transaction receipts
+    league_game = LeagueGame.at(address)
+    args = json.loads(row[6])
+    game_id, result = args["gameId"], args["result"]
+    _, home_team, away_team = [league_game.games(game_id, i) for i in range(3)]
+    # PlayerRate contract indexed along with this LeagueGame
+    (player_rate,) = db.execute(
+        "SELECT address FROM cursors WHERE contract = 'PlayerRate'"
+    ).fetchone() or (PlayerRate[-1].address,)
+    home_goals, away_goals = game_goals(PlayerRate.at(player_rate), game_id)
+    payouts = kick_transfers(league_game, row[4])
+    # The stakes are cleared by finishGame, they are read from the KICK transferred by the
+    # sign up of each team, a sign up before the first indexed block counts as a 0 stake
+    stakes = []
+    for team_id in (home_team, away_team):
+        transaction_hash = sign_up_transaction(db, team_id, row, pending_rows)
+        stakes.append(
+            kick_transfers(league_game, transaction_hash, incoming=True)
+            if transaction_hash
+            else 0
+        )
+    return home_team, away_team, home_goals, away_goals, payouts, stakes
+
+
+def on_game_finished(db, address, row, read):
+    game_id, result = [json.loads(row[6])[key] for key in ("gameId", "result")]
+    home_team, away_team, home_goals, away_goals, payouts, stakes = read
+    home_payout = payouts if result == 1 else 0 if result == 2 else payouts // 2
+    # The payouts give the stakes back, the KICK won is what a team gets over its own stake
+    home_kick = home_payout - stakes[0]
+    away_kick = payouts - home_payout - stakes[1]
+    game = (
+        game_id,
+        row[2],
+        home_team,
+        away_team,
+        home_goals,
+        away_goals,
+        result,
+        str(home_kick),
+        str(away_kick),
+    )
+    db.execute("INSERT INTO game_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", game)
+    apply_game(db, game, 1)
+
+
+def rollback(db, fork_block):
+    # Subtracts the games finished in the reorganized blocks
+    for game in db.execute(
+        "SELECT * FROM game_results WHERE block_number >= ?", (fork_block,)
+    ).fetchall():
+        apply_game(db, game, -1)
+    db.execute("DELETE FROM game_results WHERE block_number >= ?", (fork_block,))
+
+
+def register(db):
+    row = db.execute(
+        "SELECT value FROM state WHERE key = 'leaderboard_version'"
+    ).fetchone()
+    if row is None or row[0] < TABLES_VERSION:
+        with db:
+            db.execute("DROP TABLE IF EXISTS game_results")
+            db.execute("DROP TABLE IF EXISTS standings")
+            db.execute(
+                "INSERT OR REPLACE INTO state VALUES ('leaderboard_version', ?)",
+                (TABLES_VERSION,),
+            )
+    register_derived_table(
+        db,
+        "game_results",
+        SCHEMA,
+        {("LeagueGame", "gameFinished"): on_game_finished},
+        rollback,
+        {on_game_finished: read_game_finished},
+    )
+
+
+def get_standings(db, limit=None):
+    # Teams sorted by points (3 for a win, 1 for a draw) then goal difference
+    return db.execute(
+        "SELECT *, 3 * wins + draws AS points FROM standings "
+        "ORDER BY points DESC, goals_for - goals_against DESC, goals_for DESC "
+        "LIMIT ?",
+        (limit if limit else -1,),
+    ).fetchall()
+
+
+def main():
+    db = connect()
+    register(db)
+    for rank, standing in enumerate(get_standings(db, 20), start=1):
+        (
+            team_id,
+            games,
+            wins,
+            draws,
+            losses,
+            goals_for,
+            goals_against,
+            kick_won,
+            points,
+        ) = standing
+        print(
+            f"{rank}. Team {team_id} : {points} points, {games} games ({wins}-{draws}-{losses}), "
+            f"goals {goals_for}-{goals_against}, {web3.fromWei(int(kick_won), 'ether')} KICK"
+        )
@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from brownie import LeagueTeam
+from scripts.footballer_attributes import load_attributes
+from scripts.player_rates import load_position_ids, load_layout_positions
+
+FIELD_POSITIONS = 11
+HOME_SUBS = 5
+AWAY_SUBS = 4  # setPlayerRates only counts positions 27 to 30 for the away team
+# Bonus points always prevail over the players own ratings, which only break ties
+RATING_WEIGHT = 1.0 / 1024
+
+
+def fetch_rosters(league_team=None, team_ids=None):
+    # LeagueTeam.teamMembersArray of the teams (every team by default), the captain is the first member
+    league_team = league_team if league_team else LeagueTeam[-1]
+    if team_ids is None:
+        team_ids = list(range(1, league_team.nbOfTeams() + 1))
+    rosters = np.array(
+        [league_team.teamMembersArray(team_id) for team_id in team_ids],
+        dtype=np.uint16,
+    ).reshape(len(team_ids), 23)
+    return team_ids, rosters
+
+
+def position_bonuses(rosters, attributes, position_ids=None, layout_positions=None):
+    # Preferred (+2), compatible (+1) and captain (+1) bonuses of setPlayerRates
+    # for every team member on the 11 field positions of every layout: (teams x layouts x 23 x 11)
+    position_ids = load_position_ids() if position_ids is None else position_ids
+    layout_positions = (
+        load_layout_positions() if layout_positions is None else layout_positions
+    )
+    rosters = np.asarray(rosters, dtype=np.int64)
+    players = np.asarray(attributes, dtype=np.int64)[rosters]
+    codes = layout_positions[:, :FIELD_POSITIONS].astype(np.int64)[None, :, None, :]
+    preferred = position_ids[players[..., 0]][:, None, :, None] == codes
+    compatible = (
+        (players[..., 1][:, None, :, None] == codes)
+        | (players[..., 2][:, None, :, None] == codes)
+        | (players[..., 3][:, None, :, None] == codes)
+    )
+    bonuses = np.where(preferred, 2, np.where(compatible, 1, 0))
+    bonuses[:, :, 0, :] += 1  # captain
+    return bonuses
+
+
+def _subs_bonus(subs_count):
+    return int(subs_count > 2) + int(subs_count > 4)
+
+
+def score_layouts(
+    rosters, attributes, is_home=True, position_ids=None, layout_positions=None
+):
+    # Best assignment of the members of each team on each layout
+    # Returns the bonus of the lineup (teams x layouts), home, captain, position and subs terms of
+    # setPlayerRates with the home cap, and the player ids
+    # on the 16 positions of the layout (teams x layouts x 16), 0 for an empty position
+    rosters = np.asarray(rosters, dtype=np.int64)
+    attributes = np.asarray(attributes)
+    bonuses = position_bonuses(rosters, attributes, position_ids, layout_positions)
+    players = attributes[rosters].astype(np.int64)
+    ratings = players[..., 4] + players[..., 5]
+    teams, layouts = bonuses.shape[:2]
+    max_subs = HOME_SUBS if is_home else AWAY_SUBS
+    scores = np.zeros((teams, layouts))
+    lineups = np.zeros((teams, layouts, FIELD_POSITIONS + HOME_SUBS), dtype=np.uint16)
+
+    for team in range(teams):
+        members = np.flatnonzero(rosters[team])
+        if len(members) == 0:
+            continue
+        field_count = min(len(members), FIELD_POSITIONS)
+        subs_count = min(len(members) - field_count, max_subs)
+        # Bonuses of each member on each field position, as setPlayerRates adds them up
+        # before the sign up, rest and stake terms which do not depend on the lineup
+        field_bonuses = bonuses[team][:, members] + _subs_bonus(subs_count)
+        if is_home:
+            # Home team bonus, the cap at 10 only exists in the home team loop
+            field_bonuses = np.minimum(field_bonuses + 1, 10)
+        # The remaining members with the best ratings sit on the bench
+        bench_order = members[np.argsort(-ratings[team, members], kind="stable")]
+        member_ids = rosters[team, members]
+        weights = field_bonuses + ratings[team, members][None, :, None] * RATING_WEIGHT
+        for layout in range(layouts):
+            rows, columns = linear_sum_assignment(weights[layout], maximize=True)
+            lineup = lineups[team, layout]
+            lineup[columns] = member_ids[rows]
+            bench = bench_order[~np.isin(bench_order, members[rows])][:subs_count]
+            lineup[FIELD_POSITIONS : FIELD_POSITIONS + len(bench)] = rosters[
+                team, bench
+            ]
+            scores[team, layout] = field_bonuses[layout][rows, columns].sum()
+    return scores, lineups
+
+
+def best_lineups(
+    rosters, attributes, is_home=True, position_ids=None, layout_positions=None
+):
+    # Layout id, expected bonus and positions of the best lineup of each team
+    scores, lineups = score_layouts(
+        rosters, attributes, is_home, position_ids, layout_positions
+    )
+    layouts = scores.argmax(axis=1)
+    teams = np.arange(len(layouts))
+    return layouts, scores[teams, layouts], lineups[teams, layouts]
+
+
+def main():
+    team_ids, rosters = fetch_rosters()
+    layouts, scores, lineups = best_lineups(rosters, load_attributes())
+    for team_id, layout, score, lineup in zip(team_ids, layouts, scores, lineups):
+        print(f"Team {team_id} : layout {layout}, bonus {score:g}")
+        print(f"Positions : {list(lineup)}")
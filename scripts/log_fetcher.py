@@ -0,0 +1,129 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from brownie import web3
+from scripts.helpful_scripts import event_decoders
+
+INITIAL_CHUNK_SIZE = 2000  # Number of blocks of the first eth_getLogs call
+MAX_CHUNK_SIZE = 100000
+# The range grows back while the calls return less than a quarter of this number of logs
+TARGET_LOGS = 2000
+LIMIT_ERROR_CODES = [-32005]
+# Messages of the providers refusing a range (Infura, Alchemy, Polygon RPC nodes...)
+LIMIT_ERROR_MESSAGES = [
+    "more than",
+    "too many",
+    "limit exceeded",
+    "response size",
+    "block range",
+    "range is too large",
+    "timeout",
+]
+
+
+def is_range_error(error):
+    details = error.args[0] if error.args else error
+    if isinstance(details, dict) and details.get("code") in LIMIT_ERROR_CODES:
+        return True
+    message = str(details).lower()
+    return any(limit_message in message for limit_message in LIMIT_ERROR_MESSAGES)
+
+
+def fetch_logs(
+    address,
+    from_block,
+    to_block,
+    chunk_size=INITIAL_CHUNK_SIZE,
+    max_chunk_size=MAX_CHUNK_SIZE,
+    target_logs=TARGET_LOGS,
+):
+    # Yields (last block of the range, logs of the range) over [from_block, to_block]
+    # The range is halved when the provider refuses it, and doubled when the results are sparse
+    start = from_block
+    while start <= to_block:
+        end = min(start + chunk_size - 1, to_block)
+        try:
+            logs = web3.eth.get_logs(
+                {"address": address, "fromBlock": start, "toBlock": end}
+            )
+        except Exception as error:
+            if end == start or not is_range_error(error):
+                raise
+            chunk_size = max((end - start + 1) // 2, 1)
+            continue
+        yield end, logs
+        start = end + 1
+        if len(logs) < target_logs // 4:
+            chunk_size = min(chunk_size * 2, max_chunk_size)
+
+
+def stream_events(brownie_contract, from_block, to_block, **kwargs):
+    # Decoded events of a contract, in block order
+    decoders = event_decoders(brownie_contract)
+    for _, logs in fetch_logs(brownie_contract.address, from_block, to_block, **kwargs):
+        for log in logs:
+            if log["topics"] and bytes(log["topics"][0]) in decoders:
+                yield decoders[bytes(log["topics"][0])].processLog(log)
+
+
+def fetch_many(ranges, max_workers=4, put_timeout=0.1, **kwargs):
+    # ranges: list of (address, from_block, to_block), fetched in parallel by a pool of threads
+    # Yields (address, last block of the range, logs) as they arrive, in block order for each address
+    # The fetching threads wait when the consumer is late, and stop when the generator is closed
+    # or the consumer raises, so no thread is left blocked on the queue
+    if not ranges:
+        return
+    results = queue.Queue(maxsize=max_workers * 2)
+    tasks = queue.Queue()
+    for task in ranges:
+        tasks.put(task)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # False when the consumer is gone
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=put_timeout)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def worker():
+        try:
+            while not stop.is_set():
+                try:
+                    address, from_block, to_block = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    for end, logs in fetch_logs(
+                        address, from_block, to_block, **kwargs
+                    ):
+                        if not put((address, end, logs)):
+                            return
+                except Exception as error:
+                    put((address, None, error))
+                    return
+        finally:
+            put((done, None, None))
+
+    workers_count = min(max_workers, len(ranges))
+    executor = ThreadPoolExecutor(workers_count)
+    for _ in range(workers_count):
+        executor.submit(worker)
+    try:
+        finished = 0
+        while finished < workers_count:
+            address, end, logs = results.get()
+            if address is done:
+                finished += 1
+            elif end is None:
+                raise logs
+            else:
+                yield address, end, logs
+    finally:
+        stop.set()
+        # The threads leave after their current eth_getLogs call
+        executor.shutdown(wait=True)
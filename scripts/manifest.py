@@ -0,0 +1,64 @@
+import json
+import os
+from web3 import Web3
+from brownie import web3
+
+MANIFEST_DIRECTORY = "./deployments"
+
+
+def manifest_path():
+    # One manifest per chain id, the network names of a same chain share it (polygon-test and mumbai)
+    return os.path.join(MANIFEST_DIRECTORY, f"{web3.eth.chain_id}.json")
+
+
+def load_manifest(path=None):
+    path = path if path else manifest_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(manifest, path=None):
+    path = path if path else manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        manifest_file.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def bytecode_hash(container):
+    # Hash of the creation bytecode before library linking, it changes with the source or the compiler settings
+    return Web3.keccak(text=container.bytecode).hex()
+
+
+def manifest_args(args):
+    return [str(getattr(arg, "address", arg)) for arg in args]
+
+
+def args_hash(args):
+    # The arguments of a transaction step can be large (the 256 position codes), only their hash is kept
+    return Web3.keccak(text=json.dumps(manifest_args(args))).hex()
+
+
+def manifest_entry(tx, dependencies, container=None, args=None):
+    # tx: transaction of the step, deploying the contract of the container when given
+    # args: constructor arguments of the contract, or arguments of the transaction
+    entry = {"transaction": tx.txid, "dependencies": dependencies}
+    if container is None and args is not None:
+        entry["args_hash"] = args_hash(args)
+    if container:
+        entry["contract"] = container._name
+        entry["address"] = tx.contract_address
+        entry["bytecode_hash"] = bytecode_hash(container)
+        entry["args"] = manifest_args(args)
+    return entry
+
+
+def get_deployed(container):
+    # Contract of the active network recorded in the manifest
+    for entry in load_manifest().values():
+        if entry.get("contract") == container._name:
+            return container.at(entry["address"])
+    raise ValueError(f"{container._name} is not in {manifest_path()}")
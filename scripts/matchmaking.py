@@ -0,0 +1,194 @@
+import numpy as np
+from brownie import LeagueGame, LeagueTeam, web3
+from scripts.bulk_reader import read_team_games, read_team_members
+from scripts.footballer_attributes import load_attributes
+from scripts.game_simulator import DECIMALS, MIN_PLAYERS, score_goals, team_avg_rates
+from scripts.lineup_optimizer import score_layouts
+from scripts.player_rates import (
+    HOME_PLAYERS,
+    AWAY_PLAYERS,
+    DURATION_BETWEEN_GAMES,
+    player_rates,
+)
+
+GAME_START = 10 * DURATION_BETWEEN_GAMES  # any block far enough from genesis
+BLOCK_SIZE = 64  # home teams simulated together, keeps memory flat for large leagues
+
+
+def fetch_waiting_teams(league_game=None, league_team=None, block_identifier=None):
+    # Teams with teamGame[teamId][0] == 1, with their layout and stake, read through the multicall
+    league_game = league_game if league_game else LeagueGame[-1]
+    league_team = league_team if league_team else LeagueTeam[-1]
+    team_ids = list(
+        range(1, league_team.nbOfTeams(block_identifier=block_identifier) + 1)
+    )
+    team_games = read_team_games(league_game, team_ids, block_identifier)
+    waiting = [team_id for team_id in team_ids if team_games[team_id][0] == 1]
+    return (
+        waiting,
+        np.array([team_games[team_id][2] for team_id in waiting], dtype=np.int64),
+        np.array([team_games[team_id][3] for team_id in waiting], dtype=object),
+    )
+
+
+def fetch_waiting_rosters(league_team, team_ids, block_identifier=None):
+    # Same (teams x 23) rosters as lineup_optimizer.fetch_rosters, read through the multicall
+    team_members = read_team_members(league_team, team_ids, block_identifier)
+    return np.array(
+        [team_members[team_id] for team_id in team_ids], dtype=np.uint16
+    ).reshape(len(team_ids), 23)
+
+
+def team_bonuses(rosters, layouts, attributes):
+    # Best lineup of each team on its chosen layout, as home (positions 0-15) and away (16-31) team,
+    # with the setPlayerRates bonuses it gets before the stake bonus
+    teams = np.arange(len(layouts))
+    _, home_lineups = score_layouts(rosters, attributes, is_home=True)
+    _, away_lineups = score_layouts(rosters, attributes, is_home=False)
+    player_ids = np.concatenate(
+        (home_lineups[teams, layouts], away_lineups[teams, layouts]), axis=1
+    ).astype(np.int64)
+    block_signed = np.full(player_ids.shape, GAME_START)
+    # setPlayerRates reads the home sign up blocks from gamePlayers[playerId][position],
+    # which is empty for almost every player
+    block_signed[:, :16] = 0
+    bonuses, _, _ = player_rates(
+        player_ids,
+        np.asarray(attributes)[player_ids],
+        block_signed,
+        np.full(player_ids.shape, GAME_START - DURATION_BETWEEN_GAMES),
+        np.full(len(layouts), GAME_START),
+        np.stack((rosters[:, 0], rosters[:, 0]), axis=1),
+        np.stack((layouts, layouts), axis=1),
+        np.zeros((len(layouts), 2), dtype=np.int64),
+    )
+    return player_ids, bonuses.astype(np.int64)
+
+
+def _pair_rates(rosters, layouts, stakes, attributes):
+    # Yields the indexes of a block of home teams, then the player ids, defense and attack rates
+    # of their games against every team as away team, as (home teams x teams x 32) arrays
+    rosters = np.asarray(rosters, dtype=np.int64)
+    attributes = np.asarray(attributes)
+    player_ids, bonuses = team_bonuses(rosters, layouts, attributes)
+    higher_stake = (stakes[:, None] > stakes[None, :]).astype(np.int64) * 2
+    teams = len(layouts)
+    rated = np.zeros(32, dtype=bool)
+    rated[HOME_PLAYERS] = True
+    rated[AWAY_PLAYERS] = True
+
+    for start in range(0, teams, BLOCK_SIZE):
+        home = np.arange(start, min(start + BLOCK_SIZE, teams))
+        pairs = np.zeros((len(home), teams, 32), dtype=np.int64)
+        pairs[:, :, :16] = player_ids[home, None, :16]
+        pairs[:, :, 16:] = player_ids[None, :, 16:]
+        pair_bonuses = np.zeros(pairs.shape, dtype=np.int64)
+        pair_bonuses[:, :, HOME_PLAYERS] = np.minimum(
+            bonuses[home, None][..., HOME_PLAYERS] + higher_stake[home, :, None], 10
+        )
+        pair_bonuses[:, :, AWAY_PLAYERS] = (
+            bonuses[None, :][..., AWAY_PLAYERS] + higher_stake.T[home, :, None]
+        )
+        pair_attributes = attributes[pairs].astype(np.int64)
+        defense_rates = np.where(
+            rated, (pair_attributes[..., 4] + pair_bonuses) & 0xFF, 0
+        )
+        attack_rates = np.where(
+            rated, (pair_attributes[..., 5] + pair_bonuses) & 0xFF, 0
+        )
+        yield home, pairs, defense_rates, attack_rates
+
+
+def _expected(differences):
+    # The home team is drawn at random by LeagueGame.fulfillRandomness:
+    # 0.5 * (D[i, j] - D[j, i]) where D[i, j] is the game with i as home team and j as away team
+    expected = 0.5 * (differences - differences.T)
+    np.fill_diagonal(expected, np.nan)
+    return expected
+
+
+def goal_difference_matrix(rosters, layouts, stakes, attributes):
+    # Expected goal difference of team i against team j
+    # With the GameResult rule only a team whose defense sum is 0 concedes goals, so the
+    # matrix is all zeros as soon as every team has a signed up player, see rate_difference_matrix
+    teams = len(layouts)
+    differences = np.zeros((teams, teams), dtype=np.int64)
+    for home, pairs, defense_rates, attack_rates in _pair_rates(
+        rosters, layouts, stakes, attributes
+    ):
+        home_goals, away_goals, _ = score_goals(
+            pairs.reshape(-1, 32),
+            defense_rates.reshape(-1, 32),
+            attack_rates.reshape(-1, 32),
+        )
+        differences[home] = (
+            home_goals.astype(np.int64) - away_goals.astype(np.int64)
+        ).reshape(len(home), teams)
+    return _expected(differences)
+
+
+def rate_difference_matrix(rosters, layouts, stakes, attributes):
+    # Expected margin of team i against team j when no goal can be told apart: the average attack
+    # rate of a team over the opponent defense average of GameResult.teamAvgRates, minus the same
+    # margin of the opponent
+    teams = len(layouts)
+    differences = np.zeros((teams, teams))
+    for home, pairs, defense_rates, attack_rates in _pair_rates(
+        rosters, layouts, stakes, attributes
+    ):
+        pairs = pairs.reshape(-1, 32)
+        attack_rates = attack_rates.reshape(-1, 32)
+        defense_averages = (
+            team_avg_rates(pairs, defense_rates.reshape(-1, 32), attack_rates).astype(
+                float
+            )
+            / DECIMALS
+        )
+        attack_averages = np.stack(
+            [
+                np.where(pairs[:, side] > 0, attack_rates[:, side], 0).sum(axis=1)
+                / np.maximum((pairs[:, side] > 0).sum(axis=1), MIN_PLAYERS)
+                for side in (HOME_PLAYERS, AWAY_PLAYERS)
+            ],
+            axis=1,
+        )
+        margins = attack_averages - defense_averages[:, ::-1]
+        differences[home] = (margins[:, 0] - margins[:, 1]).reshape(len(home), teams)
+    return _expected(differences)
+
+
+def matchmaking(league_game=None, league_team=None, attributes=None):
+    # Returns the waiting team ids, their index in the matrix, the expected difference matrix
+    # and its measure, "goal" or "rate" when no goal is expected between the waiting teams
+    attributes = load_attributes() if attributes is None else attributes
+    league_team = league_team if league_team else LeagueTeam[-1]
+    block_identifier = web3.eth.block_number
+    team_ids, layouts, stakes = fetch_waiting_teams(
+        league_game, league_team, block_identifier
+    )
+    if len(team_ids) == 0:
+        return team_ids, {}, np.zeros((0, 0)), "goal"
+    rosters = fetch_waiting_rosters(league_team, team_ids, block_identifier)
+    expected = goal_difference_matrix(rosters, layouts, stakes, attributes)
+    measure = "goal"
+    if not np.nan_to_num(expected).any():
+        expected = rate_difference_matrix(rosters, layouts, stakes, attributes)
+        measure = "rate"
+    return (
+        team_ids,
+        {team_id: i for i, team_id in enumerate(team_ids)},
+        expected,
+        measure,
+    )
+
+
+def main():
+    team_ids, _, expected, measure = matchmaking()
+    print(f"{len(team_ids)} teams waiting for an opponent")
+    for i, team_id in enumerate(team_ids):
+        if len(team_ids) > 1:
+            best = np.nanargmax(expected[i])
+            print(
+                f"Team {team_id} : challenge team {team_ids[best]}, "
+                f"expected {measure} difference {expected[i, best]:+g}"
+            )
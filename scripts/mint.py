@@ -1,26 +1,119 @@
-from web3 import Web3
-import time
-from scripts.helpful_scripts import get_account, POLYGON_TESTNET
-from brownie import VerifiableRandomFootballer, network
+import asyncio
+from scripts.helpful_scripts import get_account, POLYGON_TESTNET, EventWaiter
+from scripts.manifest import get_deployed
+from brownie import VerifiableRandomFootballer, network, web3
 
+# generatePlayer transactions waiting for their receipt at the same time
+MAX_GENERATING = 4
+GENERATE_GAS_LIMIT = 5700000
+RANDOMNESS_TIMEOUT = 600
 
-def mint():
-    if network.show_active() in POLYGON_TESTNET:
-        verifiable_random_footballer = VerifiableRandomFootballer.at(
-            "0xD7A8585B195b595A973090Abb8406E3029D9cFe3"
-        )
-        owner = get_account()
-        request_tx = verifiable_random_footballer.requestPlayer(
-            {"from": owner, "value": Web3.toWei(0.1, "ether")}
+
+def send_player_requests(verifiable_random_footballer, account, count):
+    # Sends the requestPlayer transactions back to back, returns their requestedPlayer events
+    nonce = web3.eth.get_transaction_count(account.address, "pending")
+    request_txs = [
+        verifiable_random_footballer.requestPlayer(
+            {
+                "from": account,
+                "value": verifiable_random_footballer.price(),
+                "nonce": nonce + i,
+                "required_confs": 0,
+            }
         )
+        for i in range(count)
+    ]
+    requested_events = []
+    for request_tx in request_txs:
         request_tx.wait(1)
-        token_id = request_tx.events["requestedPlayer"]["tokenId"]
-        time.sleep(60)
-        generate_tx = verifiable_random_footballer.generatePlayer(
-            token_id, {"from": owner, "gasLimit": 5700000}
+        requested_events.append(request_tx.events["requestedPlayer"])
+    return requested_events
+
+
+def request_players(verifiable_random_footballer, account, count):
+    # Returns the requested token ids
+    return [
+        requested_event["tokenId"]
+        for requested_event in send_player_requests(
+            verifiable_random_footballer, account, count
+        )
+    ]
+
+
+async def generate_when_ready(
+    verifiable_random_footballer, account, token_id, randomness, semaphore
+):
+    # Generates the player as soon as its random number is received
+    await randomness
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        generate_tx = await loop.run_in_executor(
+            None,
+            lambda: verifiable_random_footballer.generatePlayer(
+                token_id, {"from": account, "gasLimit": GENERATE_GAS_LIMIT}
+            ),
+        )
+    print(f"Player {token_id} generated")
+    return generate_tx
+
+
+async def mint_players(
+    verifiable_random_footballer,
+    account,
+    count,
+    max_generating=MAX_GENERATING,
+    timeout=RANDOMNESS_TIMEOUT,
+    poll_interval=2,
+):
+    # Requests count players, then generates each one when its PlayerWithRandomness event is mined
+    # Returns the token ids generated, the others can be generated later with generatePlayer
+    waiter = EventWaiter(poll_interval)
+    # The randomness can be received in the blocks of the requests
+    from_block = web3.eth.block_number + 1
+    loop = asyncio.get_running_loop()
+    token_ids = await loop.run_in_executor(
+        None, request_players, verifiable_random_footballer, account, count
+    )
+    semaphore = asyncio.Semaphore(max_generating)
+    tasks = [
+        asyncio.ensure_future(
+            generate_when_ready(
+                verifiable_random_footballer,
+                account,
+                token_id,
+                waiter.wait(
+                    verifiable_random_footballer,
+                    "PlayerWithRandomness",
+                    {"tokenId": token_id},
+                    from_block,
+                ),
+                semaphore,
+            )
+        )
+        for token_id in token_ids
+    ]
+    done, not_done = await asyncio.wait(tasks, timeout=timeout)
+    for task in not_done:
+        task.cancel()
+    for token_id, task in zip(token_ids, tasks):
+        if task in done and task.exception() is not None:
+            print(f"Player {token_id} not generated : {task.exception()}")
+    return [
+        token_id
+        for token_id, task in zip(token_ids, tasks)
+        if task in done and task.exception() is None
+    ]
+
+
+def mint(count=1):
+    if network.show_active() in POLYGON_TESTNET:
+        verifiable_random_footballer = get_deployed(VerifiableRandomFootballer)
+        owner = get_account()
+        token_ids = asyncio.run(
+            mint_players(verifiable_random_footballer, owner, int(count))
         )
-        generate_tx.wait(1)
-        print(f"Token URI : {verifiable_random_footballer.tokenURI(token_id)}")
+        for token_id in token_ids:
+            print(f"Token URI : {verifiable_random_footballer.tokenURI(token_id)}")
 
 
 def main():
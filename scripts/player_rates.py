@@ -0,0 +1,163 @@
+import json
+import numpy as np
+
+# Default values set in the PlayerRate constructor
+GAME_DURATION = 2700
+DURATION_BETWEEN_GAMES = 302400
+
+HOME_PLAYERS = np.arange(0, 11)
+HOME_SUBS = np.arange(11, 16)
+AWAY_PLAYERS = np.arange(16, 27)
+AWAY_SUBS = np.arange(27, 31)  # setPlayerRates never looks at position 31
+
+
+def load_position_ids(path="./constants/positions.json"):
+    # Lookup table matching a preferred position attribute with its layout code (PlayerRate.positionIds)
+    with open(path) as positions_file:
+        positions_data = json.load(positions_file)
+    position_ids = np.zeros(256, dtype=np.uint8)
+    for position_id, position_code in positions_data.items():
+        position_ids[int(position_id)] = int(position_code)
+    return position_ids
+
+
+def load_layout_positions(path="./constants/layouts.json"):
+    # Layout codes of the 16 positions of every layout (PlayerRate.layoutPositions)
+    with open(path) as layouts_file:
+        layouts_data = json.load(layouts_file)
+    return np.array(
+        [layout["positions"] for layout in layouts_data["layouts"]], dtype=np.uint8
+    )
+
+
+def _penalty(bonus, condition, amount):
+    # A penalty never takes the bonus below 0
+    return np.where(condition, np.maximum(bonus - amount, 0), bonus)
+
+
+def _side_bonuses(
+    player_ids,
+    attributes,
+    block_signed,
+    last_game_start,
+    game_start,
+    captain,
+    layout,
+    subs_count,
+    higher_stake,
+    is_home,
+    position_ids,
+    layout_positions,
+    game_duration,
+    duration_between_games,
+):
+    # Same rules as one of the two loops of PlayerRate.setPlayerRates, on (games x 11) arrays
+    bonus = np.full(player_ids.shape, 1 if is_home else 0, dtype=np.int64)
+    bonus += player_ids == captain[:, None]
+
+    layout_codes = layout_positions[layout].astype(np.int64)[:, :11]
+    preferred = layout_codes == position_ids[attributes[..., 0]]
+    compatible = (
+        (layout_codes == attributes[..., 1])
+        | (layout_codes == attributes[..., 2])
+        | (layout_codes == attributes[..., 3])
+    )
+    bonus += np.where(preferred, 2, np.where(compatible, 1, 0))
+    bonus += (subs_count > 2)[:, None]
+    bonus += (subs_count > 4)[:, None]
+
+    start = game_start[:, None]
+    signed_before = block_signed < start
+    signed_after = block_signed - start
+    bonus = _penalty(bonus, signed_before, 2)
+    bonus += np.where(
+        signed_before,
+        0,
+        np.where(
+            signed_after < game_duration // 6,
+            2,
+            np.where(signed_after < game_duration // 2, 1, 0),
+        ),
+    )
+
+    rest = start - last_game_start
+    bonus = _penalty(bonus, rest < duration_between_games, 2)
+    bonus = _penalty(bonus, rest > 4 * duration_between_games, 1)
+    bonus = _penalty(bonus, rest > 8 * duration_between_games, 2)
+    bonus += higher_stake[:, None] * 2
+
+    if is_home:
+        # The cap only exists in the home team loop
+        bonus = np.minimum(bonus, 10)
+    return bonus
+
+
+def player_rates(
+    player_ids,
+    attributes,
+    block_signed,
+    last_game_start,
+    game_start,
+    captains,
+    layouts,
+    stakes,
+    position_ids=None,
+    layout_positions=None,
+    game_duration=GAME_DURATION,
+    duration_between_games=DURATION_BETWEEN_GAMES,
+):
+    # Vectorized port of PlayerRate.setPlayerRates for a batch of games
+    # player_ids, block_signed, last_game_start: (games x 32) arrays indexed like gamePlayers
+    # attributes: (games x 32 x 6) tokenIdToAttributes of the signed up players
+    # last_game_start: games(playerLastGame[playerId], 0) of each player
+    # game_start: (games) games(gameId, 0)
+    # captains, layouts, stakes: (games x 2) for home and away teams, teamMembers(teamId, 1) and teamGame(teamId, 2 and 3)
+    # For the home positions the contract reads the sign up block from gamePlayers[playerId][position]
+    # instead of gamePlayers[gameId][position], pass these values in block_signed to get the on-chain rates
+    # Returns the bonuses, defense rates and attack rates as (games x 32) arrays, set on positions 0-10 and 16-26 only
+    position_ids = load_position_ids() if position_ids is None else position_ids
+    layout_positions = (
+        load_layout_positions() if layout_positions is None else layout_positions
+    )
+    player_ids = np.asarray(player_ids, dtype=np.int64)
+    attributes = np.asarray(attributes, dtype=np.int64)
+    block_signed = np.asarray(block_signed, dtype=np.int64)
+    last_game_start = np.asarray(last_game_start, dtype=np.int64)
+    game_start = np.asarray(game_start, dtype=np.int64)
+    captains = np.asarray(captains, dtype=np.int64)
+    layouts = np.asarray(layouts, dtype=np.int64)
+    stakes = np.asarray(stakes, dtype=object)  # stakes are 18 decimals KICK amounts
+
+    bonuses = np.zeros(player_ids.shape, dtype=np.int64)
+    for is_home, players, subs, side, opponent in (
+        (True, HOME_PLAYERS, HOME_SUBS, 0, 1),
+        (False, AWAY_PLAYERS, AWAY_SUBS, 1, 0),
+    ):
+        bonuses[:, players] = _side_bonuses(
+            player_ids[:, players],
+            attributes[:, players],
+            block_signed[:, players],
+            last_game_start[:, players],
+            game_start,
+            captains[:, side],
+            layouts[:, side],
+            (player_ids[:, subs] > 0).sum(axis=1),
+            (stakes[:, side] > stakes[:, opponent]).astype(np.int64),
+            is_home,
+            position_ids,
+            layout_positions,
+            game_duration,
+            duration_between_games,
+        )
+
+    rated = np.zeros(player_ids.shape, dtype=bool)
+    rated[:, HOME_PLAYERS] = True
+    rated[:, AWAY_PLAYERS] = True
+    # Rates are stored as uint8
+    defense_rates = np.where(rated, (attributes[..., 4] + bonuses) & 0xFF, 0)
+    attack_rates = np.where(rated, (attributes[..., 5] + bonuses) & 0xFF, 0)
+    return (
+        bonuses.astype(np.uint8),
+        defense_rates.astype(np.uint8),
+        attack_rates.astype(np.uint8),
+    )
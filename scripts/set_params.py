@@ -1,11 +1,12 @@
 from web3 import Web3
 from scripts.helpful_scripts import get_account, POLYGON_TESTNET
+from scripts.manifest import get_deployed
 from brownie import LeagueGame, network
 
 
 def set_params():
     if network.show_active() in POLYGON_TESTNET:
-        league_game = LeagueGame.at("0x83CE4F977139EeB94d156429ED13F3A9089A0664")
+        league_game = get_deployed(LeagueGame)
         owner = get_account()
 
         set_game_delay_tx = league_game.setGameDelay([10000, 100000], {"from": owner})
@@ -0,0 +1,253 @@
+import os
+from decimal import Decimal
+import pyarrow as pa
+import pyarrow.parquet as pq
+from brownie import (
+    VerifiableRandomFootballer,
+    LeagueTeam,
+    LeagueGame,
+    PlayerRate,
+    PlayerLoan,
+    PlayerTransfer,
+    web3,
+)
+from scripts.bulk_reader import (
+    MAX_SUPPLY,
+    multicall,
+    read_footballers,
+    read_players_team,
+    read_team_members,
+    read_team_games,
+    read_game_players,
+)
+
+SNAPSHOTS_PATH = "./build/snapshots"
+CHUNK_SIZE = 500  # Number of ids read and written at once, memory does not grow with the league size
+# KICK and MATIC amounts are 18 decimals integers, larger than int64
+AMOUNT = pa.decimal128(38, 0)
+SCHEMAS = {
+    "footballers": pa.schema(
+        [("token_id", pa.uint16()), ("owner", pa.string()), ("team_id", pa.uint64())]
+        + [(f"attribute_{i}", pa.uint8()) for i in range(6)]
+    ),
+    "teams": pa.schema(
+        [
+            ("team_id", pa.uint64()),
+            ("members", pa.uint8()),
+            ("captain_id", pa.uint16()),
+            ("status", pa.uint8()),
+            ("game_id", pa.uint64()),
+            ("layout_id", pa.uint8()),
+            ("stake", AMOUNT),
+        ]
+    ),
+    "memberships": pa.schema(
+        [("team_id", pa.uint64()), ("rank", pa.uint8()), ("player_id", pa.uint16())]
+    ),
+    "applications": pa.schema([("team_id", pa.uint64()), ("player_id", pa.uint16())]),
+    "games": pa.schema(
+        [
+            ("game_id", pa.uint64()),
+            ("block_number", pa.uint64()),
+            ("home_team", pa.uint64()),
+            ("away_team", pa.uint64()),
+        ]
+    ),
+    "game_players": pa.schema(
+        [
+            ("game_id", pa.uint64()),
+            ("position", pa.uint8()),
+            ("player_id", pa.uint16()),
+            ("block_signed", pa.uint64()),
+            ("defense_rate", pa.uint8()),
+            ("attack_rate", pa.uint8()),
+        ]
+    ),
+    "loan_listings": pa.schema(
+        [
+            ("token_id", pa.uint16()),
+            ("duration", pa.uint64()),
+            ("price", AMOUNT),
+            ("borrower", pa.string()),
+            ("term", pa.uint64()),
+        ]
+    ),
+    "transfer_listings": pa.schema([("token_id", pa.uint16()), ("price", AMOUNT)]),
+}
+
+
+def chunks(ids, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start : start + chunk_size]
+
+
+def footballer_rows(ids, block_number):
+    footballers = read_footballers(VerifiableRandomFootballer[-1], ids, block_number)
+    minted = [token_id for token_id, (owner, _) in footballers.items() if owner]
+    players_team = read_players_team(LeagueTeam[-1], minted, block_number)
+    return [
+        [token_id, footballers[token_id][0], players_team[token_id]]
+        + footballers[token_id][1]
+        for token_id in minted
+    ]
+
+
+def team_rows(ids, block_number):
+    members = read_team_members(LeagueTeam[-1], ids, block_number)
+    team_games = read_team_games(LeagueGame[-1], ids, block_number)
+    return [
+        [
+            team_id,
+            sum(player_id > 0 for player_id in members[team_id]),
+            members[team_id][0],
+            team_games[team_id][0],
+            team_games[team_id][1],
+            team_games[team_id][2],
+            Decimal(team_games[team_id][3]),
+        ]
+        for team_id in ids
+    ]
+
+
+def membership_rows(ids, block_number):
+    members = read_team_members(LeagueTeam[-1], ids, block_number)
+    return [
+        [team_id, rank, player_id]
+        for team_id in ids
+        for rank, player_id in enumerate(members[team_id], start=1)
+        if player_id > 0
+    ]
+
+
+def application_rows(ids, block_number):
+    league_team = LeagueTeam[-1]
+    applications = multicall(
+        [(league_team.teamApplicationsArray, (team_id,)) for team_id in ids],
+        block_number,
+    )
+    # The first element of teamApplications is the number of applications
+    return [
+        [team_id, player_id]
+        for team_id, players in zip(ids, applications)
+        for player_id in list(players)[1:]
+        if player_id > 0
+    ]
+
+
+def game_rows(ids, block_number):
+    league_game = LeagueGame[-1]
+    games = multicall(
+        [(league_game.games, (game_id, i)) for game_id in ids for i in range(3)],
+        block_number,
+    )
+    return [[game_id] + games[3 * i : 3 * i + 3] for i, game_id in enumerate(ids)]
+
+
+def game_player_rows(ids, block_number):
+    game_players = read_game_players(PlayerRate[-1], ids, block_number)
+    return [
+        [game_id, position] + list(player)
+        for game_id in ids
+        for position, player in enumerate(game_players[game_id])
+        if player[0] > 0
+    ]
+
+
+def loan_rows(ids, block_number):
+    player_loan = PlayerLoan[-1]
+    results = multicall(
+        [(player_loan.playersForLoan, (token_id,)) for token_id in ids]
+        + [(player_loan.loans, (token_id,)) for token_id in ids],
+        block_number,
+    )
+    listings, loans = results[: len(ids)], results[len(ids) :]
+    return [
+        [token_id, duration, Decimal(price), borrower, term]
+        for token_id, (duration, price), (borrower, term) in zip(ids, listings, loans)
+    ]
+
+
+def transfer_rows(ids, block_number):
+    player_transfer = PlayerTransfer[-1]
+    prices = multicall(
+        [(player_transfer.playersForTransfer, (token_id,)) for token_id in ids],
+        block_number,
+    )
+    return [[token_id, Decimal(price)] for token_id, price in zip(ids, prices)]
+
+
+def export_table(path, schema, ids, read_rows, block_number, chunk_size=CHUNK_SIZE):
+    # Streams the rows of the ids into a parquet file, one row group per chunk
+    # The file is written under a temporary name so that an interrupted export is never read,
+    # and the temporary file is removed when the export fails
+    rows_count = 0
+    try:
+        with pq.ParquetWriter(path + ".tmp", schema) as writer:
+            for chunk in chunks(ids, chunk_size):
+                rows = read_rows(chunk, block_number)
+                if rows:
+                    columns = list(zip(*rows))
+                    writer.write_batch(
+                        pa.record_batch(
+                            [
+                                pa.array(column, type=field.type)
+                                for column, field in zip(columns, schema)
+                            ],
+                            schema=schema,
+                        )
+                    )
+                    rows_count += len(rows)
+    except BaseException:
+        if os.path.exists(path + ".tmp"):
+            os.remove(path + ".tmp")
+        raise
+    os.replace(path + ".tmp", path)
+    return rows_count
+
+
+def export_snapshot(
+    block_number=None, path=SNAPSHOTS_PATH, chunk_size=CHUNK_SIZE, max_supply=MAX_SUPPLY
+):
+    # Writes the league state at block_number (latest by default) in path/<block_number>/<table>.parquet
+    # The footballers table scans the token ids below max_supply
+    if block_number is None:
+        block_number = web3.eth.block_number
+    directory = os.path.join(path, str(block_number))
+    os.makedirs(directory, exist_ok=True)
+    team_ids = list(
+        range(1, LeagueTeam[-1].nbOfTeams(block_identifier=block_number) + 1)
+    )
+    game_ids = list(range(1, LeagueGame[-1].gameIds(block_identifier=block_number)))
+    token_ids = list(range(1, max_supply))
+    loan_ids = list(PlayerLoan[-1].getLoanListArray(block_identifier=block_number))
+    transfer_ids = list(
+        PlayerTransfer[-1].getTransferListArray(block_identifier=block_number)
+    )
+    tables = {
+        "footballers": (token_ids, footballer_rows),
+        "teams": (team_ids, team_rows),
+        "memberships": (team_ids, membership_rows),
+        "applications": (team_ids, application_rows),
+        "games": (game_ids, game_rows),
+        "game_players": (game_ids, game_player_rows),
+        "loan_listings": (loan_ids, loan_rows),
+        "transfer_listings": (transfer_ids, transfer_rows),
+    }
+    exported = {}
+    for name, (ids, read_rows) in tables.items():
+        exported[name] = export_table(
+            os.path.join(directory, f"{name}.parquet"),
+            SCHEMAS[name].with_metadata({"block_number": str(block_number)}),
+            ids,
+            read_rows,
+            block_number,
+            chunk_size,
+        )
+    return directory, exported
+
+
+def main():
+    directory, exported = export_snapshot()
+    for name, rows_count in exported.items():
+        print(f"{name} : {rows_count} rows")
+    print(f"Snapshot saved in {directory}")
@@ -1,3 +1,7 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from brownie import (
     VerifiableRandomFootballer,
     SvgLib,
@@ -11,33 +15,131 @@ from brownie import (
     GameResult,
     ClaimKickToken,
 )
+from brownie._config import CONFIG
+from scripts.manifest import load_manifest, save_manifest
+
+VERIFIED_CONTRACTS = [
+    PlayerLoan,
+    PlayerTransfer,
+    KickToken,
+    SvgLib,
+    MetadataLib,
+    VerifiableRandomFootballer,
+    LeagueTeam,
+    LeagueGame,
+    PlayerRate,
+    GameResult,
+    ClaimKickToken,
+]
+MAX_WORKERS = 4  # Explorers limit the number of requests per second of an API key
+MAX_ATTEMPTS = 5
+BACKOFF = 5  # Seconds before the first retry, doubled at each attempt
+EXPLORER_TOKENS = ["ETHERSCAN_TOKEN", "POLYGONSCAN_TOKEN"]
+
+
+def explorer_url():
+    return CONFIG.active_network.get("explorer")
+
+
+def is_verified(address, url, api_key=None):
+    # Same API as Etherscan, the source code is empty while the contract is not verified
+    response = requests.get(
+        url,
+        params={
+            "module": "contract",
+            "action": "getsourcecode",
+            "address": address,
+            "apikey": api_key or "",
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    data = response.json()
+    if str(data["status"]) != "1":
+        raise ValueError(f"Explorer error : {data['result']}")
+    return data["result"][0]["SourceCode"] != ""
+
+
+def publish_source(container, contract):
+    return container.publish_source(contract, silent=True)
+
+
+def verify_contract(
+    container,
+    contract,
+    url,
+    publish=publish_source,
+    api_key=None,
+    max_attempts=MAX_ATTEMPTS,
+    backoff=BACKOFF,
+):
+    # Publishes the source unless the explorer already has it, with an exponential backoff on errors
+    for attempt in range(max_attempts):
+        try:
+            if is_verified(contract.address, url, api_key) or publish(
+                container, contract
+            ):
+                return True
+        except Exception as error:
+            print(f"{contract._name} at {contract.address} : {error}")
+        if attempt < max_attempts - 1:
+            time.sleep(backoff * 2**attempt)
+    return False
+
+
+def verify_all(
+    contracts,
+    url,
+    publish=publish_source,
+    api_key=None,
+    max_workers=MAX_WORKERS,
+    max_attempts=MAX_ATTEMPTS,
+    backoff=BACKOFF,
+):
+    # contracts: name => (container, contract), verified by a pool of threads
+    # Returns name => True when the source is verified
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            name: executor.submit(
+                verify_contract,
+                container,
+                contract,
+                url,
+                publish,
+                api_key,
+                max_attempts,
+                backoff,
+            )
+            for name, (container, contract) in contracts.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
 
-def verify():
-    player_loan = PlayerLoan.at("0xf3E85e0b61071113f07F496A565ad3F7567424A0")
-    PlayerLoan.publish_source(player_loan)
-    player_transfer = PlayerTransfer.at("0xDB19F45D8bB71626896Cc6610028Ec8f6D3cdb63")
-    PlayerTransfer.publish_source(player_transfer)
-    kick_token = KickToken.at("0xCBb1a5BeC29b33225878042F4294832fb5D6768b")
-    KickToken.publish_source(kick_token)
-    svg_lib = SvgLib.at("0x32702337a85f0BE80A288DFe3231F1b21519135F")
-    SvgLib.publish_source(svg_lib)
-    metadata_lib = MetadataLib.at("0x8501919210E2abDad5Da04D4A719d8c177Da6b33")
-    MetadataLib.publish_source(metadata_lib)
-    verifiable_random_footballer = VerifiableRandomFootballer.at(
-        "0xD7A8585B195b595A973090Abb8406E3029D9cFe3"
+def verify(manifest=None, url=None, publish=publish_source, **kwargs):
+    # Verifies the contracts of the manifest, the verified status is cached in the manifest
+    # A redeployed contract gets a new manifest entry, and is verified again
+    save = manifest is None
+    manifest = manifest if manifest is not None else load_manifest()
+    url = url if url else explorer_url()
+    api_key = next(
+        (os.getenv(token) for token in EXPLORER_TOKENS if os.getenv(token)), None
     )
-    VerifiableRandomFootballer.publish_source(verifiable_random_footballer)
-    league_team = LeagueTeam.at("0xBC8765fe84598C70D48Ca3b3D63b9afe5Ff805B9")
-    LeagueTeam.publish_source(league_team)
-    league_game = LeagueGame.at("0x83CE4F977139EeB94d156429ED13F3A9089A0664")
-    LeagueGame.publish_source(league_game)
-    player_rate = PlayerRate.at("0xBA462de910068f4B3675c9C1A92F725E81CE4524")
-    PlayerRate.publish_source(player_rate)
-    game_result = GameResult.at("0xfB38A5E7B056dDa86CA5A2E494fC0c3ed5247076")
-    GameResult.publish_source(game_result)
-    claim_kick_token = ClaimKickToken.at("0x996198DF82B0773123a6405Bf978cA1426Cae6F6")
-    ClaimKickToken.publish_source(claim_kick_token)
+    containers = {container._name: container for container in VERIFIED_CONTRACTS}
+    contracts = {
+        name: (
+            containers[entry["contract"]],
+            containers[entry["contract"]].at(entry["address"]),
+        )
+        for name, entry in manifest.items()
+        if entry.get("contract") in containers and not entry.get("verified")
+    }
+    results = verify_all(contracts, url, publish, api_key, **kwargs)
+    for name, verified in results.items():
+        manifest[name]["verified"] = verified
+        print(f"{name} {'verified' if verified else 'not verified'}")
+    if save:
+        save_manifest(manifest)
+    return results
 
 
 def main():
@@ -1,13 +1,12 @@
 from web3 import Web3
 from scripts.helpful_scripts import get_account, POLYGON_TESTNET
+from scripts.manifest import get_deployed
 from brownie import VerifiableRandomFootballer, network
 
 
 def withdraw():
     if network.show_active() in POLYGON_TESTNET:
-        verifiable_random_footballer = VerifiableRandomFootballer.at(
-            "0xD7A8585B195b595A973090Abb8406E3029D9cFe3"
-        )
+        verifiable_random_footballer = get_deployed(VerifiableRandomFootballer)
         owner = get_account()
 
         withdraw_amount = Web3.fromWei(verifiable_random_footballer.balance(), "ether")
@@ -0,0 +1,88 @@
+import pytest
+from brownie import chain, network
+from brownie.network import rpc
+from brownie._config import CONFIG
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.deploy import deploy
+from scenarios import build_league
+
+
+@pytest.fixture(scope="session")
+def deployed_world():
+    # The contracts are deployed once per session, with a snapshot of the chain right after
+    # scenario is the league state built on top of it, see league_scenario
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        return None
+    contracts = deploy()
+    return {
+        "contracts": contracts,
+        "snapshot": chain_snapshot(),
+        "scenario": None,
+    }
+
+
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation(deployed_world):
+    # Overrides the brownie fixture, its chain.reset() would also drop the deployed world
+    # Each module starts and ends on the chain right after the deployment instead
+    # brownie test -n auto only runs the tests using module_isolation, each xdist worker then
+    # launches its own ganache on the port of the network + its worker id, and deploys its world
+    if deployed_world is not None:
+        revert_world(deployed_world)
+    yield
+    if deployed_world is not None and not CONFIG.argv["interrupt"]:
+        revert_world(deployed_world)
+
+
+def chain_snapshot(revert_to=None):
+    # Takes a snapshot of the chain, or reverts to revert_to, and returns the new snapshot id
+    # The fixtures keep their snapshot ids here, chain.snapshot() holds a single one for the tests
+    # The only private brownie calls of the tests, written against eth-brownie 1.19:
+    # chain._revert notifies the brownie objects of the revert, then takes a new snapshot
+    # as a ganache snapshot is consumed by the revert
+    if revert_to is None:
+        return rpc.Rpc().snapshot()
+    return chain._revert(revert_to)
+
+
+def revert_world(deployed_world):
+    # The snapshots taken after the deployed world are dropped by ganache, so the scenario one is lost
+    deployed_world["snapshot"] = chain_snapshot(deployed_world["snapshot"])
+    deployed_world["scenario"] = None
+
+
+@pytest.fixture
+def deployed(deployed_world):
+    # Same tuple as scripts.deploy.deploy(), every test starts from the freshly deployed world
+    # The snapshot is kept outside of chain.snapshot() so the tests can still take their own
+    if deployed_world is None:
+        return None
+    revert_world(deployed_world)
+    return deployed_world["contracts"]
+
+
+@pytest.fixture
+def league_scenario(deployed_world):
+    # Factory returning (contracts, league) for the parameters of scenarios.build_league
+    # The league is built once, then the tests asking for the same parameters in a row
+    # revert to its snapshot, another parameter set is built again from the deployed world
+    # Only the last parameter set is cached: reverting to the deployed world drops the
+    # snapshots taken after it, as ganache keeps a single branch of snapshots
+    # module_isolation reverts to the deployed world, so each module builds its leagues again
+    def scenario(
+        teams=2, players=11, scheduled_game=True, signed_up=True, generated=True
+    ):
+        if deployed_world is None:
+            return None, None
+        key = (teams, players, scheduled_game, signed_up, generated)
+        if deployed_world["scenario"] and deployed_world["scenario"][0] == key:
+            _, snapshot, league = deployed_world["scenario"]
+            snapshot = chain_snapshot(snapshot)
+        else:
+            revert_world(deployed_world)
+            league = build_league(deployed_world["contracts"], *key)
+            snapshot = chain_snapshot()
+        deployed_world["scenario"] = (key, snapshot, league)
+        return deployed_world["contracts"], league
+
+    return scenario
@@ -0,0 +1,80 @@
+from web3 import Web3
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from scripts.indexer import (
+    connect,
+    index_events,
+    find_fork_block,
+    rollback,
+    get_cursor,
+)
+from brownie import network, chain, web3
+import pytest
+
+
+def requested_players(db):
+    return [
+        transaction_hash
+        for (transaction_hash,) in db.execute(
+            "SELECT transaction_hash FROM events WHERE event = 'requestedPlayer' "
+            "ORDER BY block_number"
+        )
+    ]
+
+
+def test_indexer_rolls_back_reorganized_blocks(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    verifiable_random_footballer, _, _, _, _, _, _, _, _ = deployed
+    db = connect(":memory:")
+    index_events(db, [verifiable_random_footballer], confirmations=10)
+    assert requested_players(db) == []
+    # Index a player request, then replace its block by a transfer and two other requests
+    chain.snapshot()
+    request_tx = verifiable_random_footballer.requestPlayer(
+        {"from": owner, "value": Web3.toWei(0.1, "ether")}
+    )
+    request_tx.wait(1)
+    index_events(db, [verifiable_random_footballer], confirmations=10)
+    assert requested_players(db) == [request_tx.txid]
+    stale_txid = request_tx.txid
+    fork_block = request_tx.block_number
+    chain.revert()
+    # The replacement branch starts with another transaction, so the requests get new txids
+    send_tx = owner.transfer(get_account(index=1), Web3.toWei(0.01, "ether"))
+    send_tx.wait(1)
+    assert (
+        web3.eth.get_block(fork_block).hash.hex()
+        != db.execute(
+            "SELECT block_hash FROM blocks WHERE block_number = ?", (fork_block,)
+        ).fetchone()[0]
+    )
+    request_txs = []
+    for _ in range(2):
+        request_tx = verifiable_random_footballer.requestPlayer(
+            {"from": owner, "value": Web3.toWei(0.1, "ether")}
+        )
+        request_tx.wait(1)
+        request_txs.append(request_tx.txid)
+    assert stale_txid not in request_txs
+
+    assert find_fork_block(db) == fork_block
+    rollback(db, fork_block)
+    assert requested_players(db) == []
+    assert (
+        get_cursor(
+            db, "VerifiableRandomFootballer", verifiable_random_footballer.address
+        )
+        == fork_block - 1
+    )
+    assert db.execute(
+        "SELECT COUNT(*) FROM blocks WHERE block_number >= ?", (fork_block,)
+    ).fetchone() == (0,)
+
+    index_events(db, [verifiable_random_footballer], confirmations=10)
+    assert requested_players(db) == request_txs
+    for block_number, block_hash in db.execute(
+        "SELECT block_number, block_hash FROM blocks"
+    ).fetchall():
+        assert block_hash == web3.eth.get_block(block_number).hash.hex()
+    assert find_fork_block(db) is None
@@ -0,0 +1,120 @@
+from web3 import Web3
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from scripts.indexer import (
+    connect,
+    index_events,
+    EVENT_HANDLERS,
+    EVENT_READERS,
+    ROLLBACK_HOOKS,
+)
+from scripts import appearances, leaderboard
+from scenarios import STAKE
+from brownie import network
+import pytest
+
+
+@pytest.fixture
+def db():
+    # The handlers of the derived tables are registered globally, each test starts without them
+    yield connect(":memory:")
+    EVENT_HANDLERS.clear()
+    ROLLBACK_HOOKS.clear()
+    EVENT_READERS.clear()
+
+
+def finish_game(contracts, league):
+    owner = get_account()
+    _, kick_token, _, _, _, league_game, player_rate, _, _ = contracts
+    set_tx = player_rate.setGameDuration(0, {"from": owner})
+    set_tx.wait(1)
+    send_tx = kick_token.transfer(
+        league_game.address, Web3.toWei(100, "ether"), {"from": owner}
+    )
+    send_tx.wait(1)
+    finish_tx = league_game.finishGame(league["game_id"], {"from": owner})
+    finish_tx.wait(1)
+    return finish_tx
+
+
+def test_appearances_keep_sign_up_block_when_settlement_is_indexed_first(
+    league_scenario, db
+):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    _, _, _, _, _, league_game, player_rate, _, _ = contracts
+    game_id = league["game_id"]
+    blocks_signed = {
+        player_id: player_rate.gamePlayers(game_id, position)[1]
+        for player_id, position in league["positions"].items()
+    }
+    finish_game(contracts, league)
+    appearances.register(db)
+
+    # The settlement is stored before the sign ups, as when LeagueGame is fetched first
+    index_events(db, [league_game], confirmations=0)
+    for player_id in league["positions"]:
+        ((_, _, block_signed, defense_rate, _),) = appearances.get_appearances(
+            db, player_id
+        )
+        assert block_signed is None
+        assert defense_rate is not None
+    index_events(db, [player_rate], confirmations=0)
+
+    for player_id, position in league["positions"].items():
+        rates = player_rate.gamePlayers(game_id, position)
+        assert appearances.get_appearances(db, player_id) == [
+            (game_id, position, blocks_signed[player_id], rates[2], rates[3])
+        ]
+
+
+@pytest.mark.parametrize("indexed_first", [False, True])
+def test_leaderboard_counts_kick_won_over_the_stake(league_scenario, db, indexed_first):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    _, _, _, _, _, league_game, player_rate, _, _ = contracts
+    bonus = league_game.prices(2)
+    finish_tx = finish_game(contracts, league)
+    result = finish_tx.events["gameFinished"]["result"]
+    # The stakes come from the sign up events stored along with gameFinished,
+    # or already stored when the table is filled by register
+    if indexed_first:
+        index_events(db, [player_rate, league_game], confirmations=0)
+        leaderboard.register(db)
+    else:
+        leaderboard.register(db)
+        index_events(db, [player_rate, league_game], confirmations=0)
+
+    home_team_id = league["home"]["team_id"]
+    away_team_id = league["away"]["team_id"]
+    ((_, _, home_team, away_team, home_goals, away_goals, stored_result, _, _),) = (
+        db.execute("SELECT * FROM game_results").fetchall()
+    )
+    assert (home_team, away_team, stored_result) == (
+        home_team_id,
+        away_team_id,
+        result,
+    )
+    # Both teams staked STAKE, the winner gets the stake of the loser and the bonus
+    if result == 1:
+        home_kick, away_kick, home_record = STAKE + bonus, -STAKE, (1, 0, 0)
+    elif result == 2:
+        home_kick, away_kick, home_record = -STAKE, STAKE + bonus, (0, 0, 1)
+    else:
+        home_kick, away_kick, home_record = bonus // 2, bonus // 2, (0, 1, 0)
+    standings = {row[0]: row[1:8] for row in leaderboard.get_standings(db)}
+    assert standings[home_team_id] == (
+        1,
+        *home_record,
+        home_goals,
+        away_goals,
+        str(home_kick),
+    )
+    assert standings[away_team_id] == (
+        1,
+        *reversed(home_record),
+        away_goals,
+        home_goals,
+        str(away_kick),
+    )
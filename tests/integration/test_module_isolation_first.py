@@ -0,0 +1,29 @@
+from web3 import Web3
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from brownie import network
+import pytest
+
+# Runs before test_module_isolation_second.py, which checks that these transactions are gone
+AMOUNT = Web3.toWei(7, "ether")
+
+
+def test_module_changes_the_chain(deployed_world):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    kick_token = deployed_world["contracts"][1]
+    receiver = get_account(index=9)
+    assert kick_token.balanceOf(receiver) == 0
+
+    transfer_tx = kick_token.transfer(receiver, AMOUNT, {"from": get_account()})
+    transfer_tx.wait(1)
+
+    assert kick_token.balanceOf(receiver) == AMOUNT
+
+
+def test_module_state_is_kept_between_its_tests(deployed_world):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    kick_token = deployed_world["contracts"][1]
+
+    # Only the deployed and league_scenario fixtures revert the chain for each test
+    assert kick_token.balanceOf(get_account(index=9)) == AMOUNT
@@ -0,0 +1,12 @@
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from brownie import network
+import pytest
+
+
+def test_previous_module_state_does_not_leak(deployed_world):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    kick_token = deployed_world["contracts"][1]
+
+    # The KICK sent in test_module_isolation_first.py was reverted by module_isolation
+    assert kick_token.balanceOf(get_account(index=9)) == 0
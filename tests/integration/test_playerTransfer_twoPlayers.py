@@ -5,12 +5,11 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network
 import pytest
 
 
-def test_can_list_two_players():
+def test_can_list_two_players(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -25,7 +24,7 @@ def test_can_list_two_players():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
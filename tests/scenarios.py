@@ -0,0 +1,201 @@
+from web3 import Web3
+from scripts.helpful_scripts import get_account, get_contract, fund_with_link
+from scripts.mint import send_player_requests
+from scripts.player_rates import HOME_PLAYERS
+
+# League states built on a freshly deployed local chain, see build_league
+# Test helpers only, importable from the tests as the tests directory holds conftest.py
+KICK_PER_TEAM = Web3.toWei(1000, "ether")
+STAKE = Web3.toWei(4, "ether")
+LAYOUT_ID = 8
+RANDOM_SEED = 5665498700435978654
+GAME_RANDOM_NUMBER = 5460505
+POSITIONS_PER_TEAM = (
+    16  # 11 starters and 5 substitutes, home team from 0, away team from 16
+)
+
+
+def mint_players(verifiable_random_footballer, account, count, generated=True):
+    # Requests the players back to back, then answers each request through the VRF coordinator mock
+    owner = get_account()
+    player_ids = []
+    for requested_event in send_player_requests(
+        verifiable_random_footballer, account, count
+    ):
+        player_id = requested_event["tokenId"]
+        get_contract("vrf_coordinator").callBackWithRandomness(
+            requested_event["requestId"],
+            RANDOM_SEED + player_id,
+            verifiable_random_footballer.address,
+            {"from": owner},
+        )
+        player_ids.append(player_id)
+    if generated:
+        for player_id in player_ids:
+            generate_tx = verifiable_random_footballer.generatePlayer(
+                player_id, {"from": account}
+            )
+            generate_tx.wait(1)
+    return player_ids
+
+
+def build_team(contracts, account, players, generated=True):
+    # Mints the players of account, the first one creates the team and validates the others
+    verifiable_random_footballer, kick_token, _, _, league_team, _, _, _, _ = contracts
+    player_ids = mint_players(verifiable_random_footballer, account, players, generated)
+    captain_id = player_ids[0]
+    approve_tx = kick_token.approve(
+        league_team.address, KICK_PER_TEAM, {"from": account}
+    )
+    approve_tx.wait(1)
+    create_tx = league_team.createTeam(captain_id, {"from": account})
+    create_tx.wait(1)
+    team_id = create_tx.events["teamCreation"]["teamId"]
+    for player_id in player_ids[1:]:
+        apply_tx = league_team.applyForTeam(player_id, team_id, {"from": account})
+        apply_tx.wait(1)
+        validate_tx = league_team.validateApplication(
+            player_id, team_id, {"from": account}
+        )
+        validate_tx.wait(1)
+    return {
+        "team_id": team_id,
+        "account": account,
+        "captain_id": captain_id,
+        "player_ids": player_ids,
+    }
+
+
+def schedule_game(contracts, team, opponent):
+    # Signs up both teams, team challenges opponent and the game is set in the block of the VRF answer
+    # The challenge time, game delay and preregistration are shortened on the league contracts
+    owner = get_account()
+    _, kick_token, _, _, _, league_game, player_rate, _, _ = contracts
+    for signed_team in (team, opponent):
+        approve_tx = kick_token.approve(
+            league_game.address, KICK_PER_TEAM, {"from": signed_team["account"]}
+        )
+        approve_tx.wait(1)
+        sign_up_team_tx = league_game.signUpTeam(
+            signed_team["team_id"], LAYOUT_ID, STAKE, {"from": signed_team["account"]}
+        )
+        sign_up_team_tx.wait(1)
+    set_tx = league_game.setChallengeTime(0, {"from": owner})
+    set_tx.wait(1)
+    challenge_tx = league_game.challengeTeam(
+        team["team_id"], opponent["team_id"], {"from": team["account"]}
+    )
+    challenge_tx.wait(1)
+    set_tx = league_game.setGameDelay([0, 1], {"from": owner})
+    set_tx.wait(1)
+    request_tx = league_game.requestGame(
+        team["team_id"], opponent["team_id"], {"from": owner}
+    )
+    request_tx.wait(1)
+    request_id = request_tx.events["gameRequested"]["requestId"]
+    game_id = request_tx.events["gameRequested"]["gameId"]
+    get_contract("vrf_coordinator").callBackWithRandomness(
+        request_id, GAME_RANDOM_NUMBER, league_game.address, {"from": owner}
+    )
+    set_tx = player_rate.setPreRegistration(0, {"from": owner})
+    set_tx.wait(1)
+    return game_id
+
+
+def sign_up_players(contracts, game_id, team, first_position):
+    # Signs up the players of the team in their order, up to the 16 positions of a side
+    _, _, _, _, _, _, player_rate, _, _ = contracts
+    positions = {}
+    for position, player_id in enumerate(
+        team["player_ids"][:POSITIONS_PER_TEAM], start=first_position
+    ):
+        sign_up_tx = player_rate.signUpPlayer(
+            player_id, team["team_id"], game_id, position, {"from": team["account"]}
+        )
+        sign_up_tx.wait(1)
+        positions[player_id] = position
+    return positions
+
+
+def build_league(
+    contracts, teams=2, players=11, scheduled_game=True, signed_up=True, generated=True
+):
+    # contracts: same tuple as scripts.deploy.deploy(), on a local network
+    # Team i belongs to account i, which receives KICK from the owner, and has players members
+    # With scheduled_game, the first two teams play a game, and with signed_up their players
+    # are signed up for it
+    owner = get_account()
+    verifiable_random_footballer, kick_token, _, _, _, league_game, _, _, _ = contracts
+    fund_with_link(
+        verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
+    )
+    fund_with_link(league_game.address, owner, None, Web3.toWei(100, "ether"))
+    league = {"teams": [], "game_id": None, "home": None, "away": None, "positions": {}}
+    for i in range(teams):
+        account = get_account(index=i)
+        if i > 0:
+            send_tx = kick_token.transfer(account, KICK_PER_TEAM, {"from": owner})
+            send_tx.wait(1)
+        league["teams"].append(build_team(contracts, account, players, generated))
+    if scheduled_game:
+        game_id = schedule_game(contracts, league["teams"][0], league["teams"][1])
+        # The VRF answer may swap the home and away teams
+        home_team_id = league_game.games(game_id, 1)
+        home, away = sorted(
+            league["teams"][:2], key=lambda team: team["team_id"] != home_team_id
+        )
+        league.update({"game_id": game_id, "home": home, "away": away})
+        if signed_up:
+            league["positions"].update(sign_up_players(contracts, game_id, home, 0))
+            league["positions"].update(
+                sign_up_players(contracts, game_id, away, POSITIONS_PER_TEAM)
+            )
+    return league
+
+
+def game_inputs(contracts, game_id, block_identifier=None):
+    # Arguments of scripts.player_rates.player_rates for one game, read on-chain before setPlayerRates
+    # The home block_signed values are the ones read by the contract, see player_rates
+    (
+        verifiable_random_footballer,
+        _,
+        _,
+        _,
+        league_team,
+        league_game,
+        player_rate,
+        _,
+        _,
+    ) = contracts
+    call = {"block_identifier": block_identifier}
+    player_ids = [player[0] for player in player_rate.getGamePlayers(game_id, **call)]
+    block_signed = []
+    for position, player_id in enumerate(player_ids):
+        signed_game_id = player_id if position in HOME_PLAYERS else game_id
+        block_signed.append(
+            player_rate.gamePlayers(signed_game_id, position, **call)[1]
+        )
+    attributes = {
+        player_id: [
+            verifiable_random_footballer.tokenIdToAttributes(player_id, i, **call)
+            for i in range(6)
+        ]
+        for player_id in set(player_ids)
+    }
+    last_game_start = {
+        player_id: league_game.games(
+            player_rate.playerLastGame(player_id, **call), 0, **call
+        )
+        for player_id in set(player_ids)
+    }
+    team_ids = [league_game.games(game_id, i, **call) for i in (1, 2)]
+    return (
+        [player_ids],
+        [[attributes[player_id] for player_id in player_ids]],
+        [block_signed],
+        [[last_game_start[player_id] for player_id in player_ids]],
+        [league_game.games(game_id, 0, **call)],
+        [[league_team.teamMembers(team_id, 1, **call) for team_id in team_ids]],
+        [[league_game.teamGame(team_id, 2, **call) for team_id in team_ids]],
+        [[league_game.teamGame(team_id, 3, **call) for team_id in team_ids]],
+    )
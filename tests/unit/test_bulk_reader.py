@@ -0,0 +1,74 @@
+import pytest
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from scripts.bulk_reader import multicall, read_league_state
+from scenarios import mint_players
+from brownie import network, web3
+
+
+def test_league_state_matches_direct_calls(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    (
+        verifiable_random_footballer,
+        _,
+        _,
+        _,
+        league_team,
+        league_game,
+        player_rate,
+        _,
+        _,
+    ) = contracts
+    # 200 token ids are 1400 calls, sent in two batches
+    state = read_league_state(max_supply=201)
+    block = {"block_identifier": state["block_number"]}
+
+    minted = [player_id for team in league["teams"] for player_id in team["player_ids"]]
+    assert sorted(state["footballers"]) == sorted(minted)
+    for player_id in minted:
+        assert state["footballers"][player_id] == (
+            verifiable_random_footballer.ownerOf(player_id, **block),
+            [
+                verifiable_random_footballer.tokenIdToAttributes(player_id, i, **block)
+                for i in range(6)
+            ],
+        )
+        assert state["players_team"][player_id] == league_team.playersTeam(
+            player_id, **block
+        )
+    for team in league["teams"]:
+        team_id = team["team_id"]
+        assert state["team_members"][team_id] == list(
+            league_team.teamMembersArray(team_id, **block)
+        )
+        assert state["team_games"][team_id] == [
+            league_game.teamGame(team_id, rank, **block) for rank in range(4)
+        ]
+    game_id = league["game_id"]
+    assert state["game_players"][game_id] == [
+        tuple(player) for player in player_rate.getGamePlayers(game_id, **block)
+    ]
+
+
+def test_multicall_reads_every_batch_at_the_same_block(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    verifiable_random_footballer = contracts[0]
+    block_number = web3.eth.block_number
+    (player_id,) = mint_players(verifiable_random_footballer, get_account(), 1)
+    calls = [
+        (verifiable_random_footballer.ownerOf, (token_id,))
+        for token_id in range(1, player_id + 1)
+    ]
+
+    # The token minted after block_number does not exist yet, its reverted call is None
+    owners = multicall(calls, block_identifier=block_number, batch_size=5)
+    assert len(owners) == player_id
+    assert owners[:-1] == [
+        verifiable_random_footballer.ownerOf(token_id)
+        for token_id in range(1, player_id)
+    ]
+    assert owners[-1] is None
+    assert multicall(calls, batch_size=5)[-1] == get_account().address
@@ -0,0 +1,110 @@
+from web3 import Web3
+import pytest
+from scripts.helpful_scripts import (
+    LOCAL_BLOCKCHAIN_ENVIRONMENTS,
+    get_account,
+    get_contract,
+    fund_with_link,
+)
+from concurrent.futures import ThreadPoolExecutor
+from scripts.call_cache import CallCache
+from scripts.indexer import connect, index_events
+from brownie import network, chain
+
+
+def generate_player(verifiable_random_footballer):
+    owner = get_account()
+    fund_with_link(
+        verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
+    )
+    request_tx = verifiable_random_footballer.requestPlayer(
+        {"from": owner, "value": Web3.toWei(0.1, "ether")}
+    )
+    request_tx.wait(1)
+    request_id = request_tx.events["requestedPlayer"]["requestId"]
+    token_id = request_tx.events["requestedPlayer"]["tokenId"]
+    get_contract("vrf_coordinator").callBackWithRandomness(
+        request_id, 987, verifiable_random_footballer.address
+    )
+    generate_tx = verifiable_random_footballer.generatePlayer(token_id, {"from": owner})
+    generate_tx.wait(1)
+    return token_id
+
+
+def test_can_reuse_head_block(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    verifiable_random_footballer, _, _, _, _, _, _, _, _ = deployed
+    cache = CallCache(head_ttl=3600)
+    price = cache.call(verifiable_random_footballer.price)
+    head = cache.head_block()
+    chain.mine(1)
+
+    # The head is not read again before head_ttl, the call is answered from the cache
+    assert cache.call(verifiable_random_footballer.price) == price
+    assert cache.head_block() == head
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_can_finalize_results_from_indexed_events(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    verifiable_random_footballer, _, _, _, _, _, _, _, _ = deployed
+    token_id = generate_player(verifiable_random_footballer)
+    db = connect(":memory:")
+    cache = CallCache(head_ttl=0, db=db)
+    attribute = verifiable_random_footballer.tokenIdToAttributes(token_id, 4)
+
+    # Not final while PlayerGenerated is not in a final block of the indexer
+    index_events(db, [verifiable_random_footballer], confirmations=1000)
+    assert (
+        cache.call(verifiable_random_footballer.tokenIdToAttributes, token_id, 4)
+        == attribute
+    )
+    assert not cache.is_final(
+        verifiable_random_footballer.address, "tokenIdToAttributes", (token_id,)
+    )
+
+    index_events(db, [verifiable_random_footballer], confirmations=0)
+    for _ in range(2):
+        chain.mine(1)
+        assert (
+            cache.call(verifiable_random_footballer.tokenIdToAttributes, token_id, 4)
+            == attribute
+        )
+    assert cache.is_final(
+        verifiable_random_footballer.address, "tokenIdToAttributes", (token_id,)
+    )
+    # The result is stored once without block number, then read from the cache
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_can_share_cache_between_threads(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    verifiable_random_footballer, _, _, _, _, _, _, _, _ = deployed
+    token_id = generate_player(verifiable_random_footballer)
+    attributes = [
+        verifiable_random_footballer.tokenIdToAttributes(token_id, i) for i in range(6)
+    ]
+    db = connect(":memory:", check_same_thread=False)
+    index_events(db, [verifiable_random_footballer], confirmations=0)
+    # head_ttl=0, every call reads the head and syncs the final events from its own thread
+    cache = CallCache(head_ttl=0, db=db)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda i: cache.call(
+                    verifiable_random_footballer.tokenIdToAttributes, token_id, i % 6
+                ),
+                range(24),
+            )
+        )
+
+    assert results == attributes * 4
+    assert cache.is_final(
+        verifiable_random_footballer.address, "tokenIdToAttributes", (token_id,)
+    )
+    assert cache.hits + cache.misses == 24
+    assert len(cache.entries) == 6
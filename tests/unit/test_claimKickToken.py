@@ -6,12 +6,11 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network, exceptions
 from brownie.network.state import Chain
 
 
-def test_can_claim_token():
+def test_can_claim_token(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get two different accounts
@@ -28,7 +27,7 @@ def test_can_claim_token():
         _,
         _,
         claim_kick_token,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -82,7 +81,7 @@ def test_can_claim_token():
     assert claim_tx.events["tokenClaimed"]["tokenId"] == player_id
 
 
-def test_can_withdraw_kick():
+def test_can_withdraw_kick(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -97,7 +96,7 @@ def test_can_withdraw_kick():
         _,
         _,
         claim_kick_token,
-    ) = deploy()
+    ) = deployed
 
     # Withdraw from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -0,0 +1,59 @@
+from web3 import Web3
+import pytest
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from scripts.deploy import run_steps
+from scripts.manifest import load_manifest, save_manifest
+from brownie import KickToken, network, web3
+
+
+def kick_steps(amount):
+    # A deployment and a transaction depending on it
+    return {
+        "kick_token": ([], KickToken, lambda done: []),
+        "transfer_kick": (
+            ["kick_token"],
+            None,
+            lambda done: (done["kick_token"].transfer, [get_account(index=1), amount]),
+        ),
+    }
+
+
+def test_can_reuse_and_redeploy_manifest_steps(deployed, tmp_path):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    path = str(tmp_path / "manifest.json")
+    done = run_steps(kick_steps(Web3.toWei(1, "ether")), owner, {}, path)
+    manifest = load_manifest(path)
+    assert manifest["kick_token"]["address"] == done["kick_token"].address
+    assert manifest["transfer_kick"]["transaction"] == done["transfer_kick"].txid
+
+    # Nothing changed, nothing is sent
+    nonce = web3.eth.get_transaction_count(owner.address)
+    reused = run_steps(kick_steps(Web3.toWei(1, "ether")), owner, manifest, path)
+    assert web3.eth.get_transaction_count(owner.address) == nonce
+    assert reused["kick_token"].address == done["kick_token"].address
+    assert reused["transfer_kick"] == done["transfer_kick"].txid
+
+    # New arguments of the transaction, only the transaction is sent again
+    resent = run_steps(kick_steps(Web3.toWei(2, "ether")), owner, manifest, path)
+    assert web3.eth.get_transaction_count(owner.address) == nonce + 1
+    assert resent["kick_token"].address == done["kick_token"].address
+    assert resent["transfer_kick"].txid != done["transfer_kick"].txid
+    assert load_manifest(path)["transfer_kick"]["transaction"] == (
+        resent["transfer_kick"].txid
+    )
+
+    # New bytecode, the contract is deployed again and the transaction follows it
+    manifest = load_manifest(path)
+    manifest["kick_token"]["bytecode_hash"] = "0x00"
+    save_manifest(manifest, path)
+    redeployed = run_steps(kick_steps(Web3.toWei(2, "ether")), owner, manifest, path)
+    assert web3.eth.get_transaction_count(owner.address) == nonce + 3
+    assert redeployed["kick_token"].address != done["kick_token"].address
+    assert redeployed["kick_token"].balanceOf(get_account(index=1)) == Web3.toWei(
+        2, "ether"
+    )
+    assert load_manifest(path)["kick_token"]["address"] == (
+        redeployed["kick_token"].address
+    )
@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from scripts import helpful_scripts
+from scripts.helpful_scripts import EventWaiter
+
+POLL_INTERVAL = 0.01
+EVENTS = ["PlayerWithRandomness", "gameRequested"]
+
+
+class FakeChain:
+    # Node answering eth_blockNumber and eth_getLogs, a block is mined for each emitted log
+    def __init__(self):
+        self.block_number = 10
+        self.logs = []
+        self.calls = []
+        self.errors = 0
+
+    def emit(self, address, event, **args):
+        self.block_number += 1
+        self.logs.append(
+            {
+                "address": address,
+                "topics": [event.encode()],
+                "blockNumber": self.block_number,
+                "event": event,
+                "args": args,
+            }
+        )
+
+    def get_logs(self, params):
+        self.calls.append(params)
+        if self.errors:
+            self.errors -= 1
+            raise ConnectionError("node unavailable")
+        return [
+            log
+            for log in self.logs
+            if log["address"] in params["address"]
+            and params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]
+        ]
+
+
+def decode(log):
+    return SimpleNamespace(event=log["event"], args=log["args"])
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    fake_chain = FakeChain()
+    monkeypatch.setattr(helpful_scripts, "web3", SimpleNamespace(eth=fake_chain))
+    monkeypatch.setattr(
+        helpful_scripts,
+        "event_decoders",
+        lambda contract: {
+            event.encode(): SimpleNamespace(processLog=decode) for event in EVENTS
+        },
+    )
+    return fake_chain
+
+
+def test_waiters_share_one_poll_loop(fake_chain):
+    footballer = SimpleNamespace(address="0xA")
+    league_game = SimpleNamespace(address="0xB")
+    # Mined before the waiters, never returned
+    fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=1)
+
+    async def wait_all():
+        waiter = EventWaiter(POLL_INTERVAL)
+        futures = [
+            waiter.wait(footballer, "PlayerWithRandomness", {"tokenId": 1}),
+            waiter.wait(footballer, "PlayerWithRandomness", {"tokenId": 2}),
+            waiter.wait(league_game, "gameRequested"),
+        ]
+        task = waiter.task
+        await asyncio.sleep(5 * POLL_INTERVAL)
+        fake_chain.emit("0xB", "gameRequested", gameId=1)
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=2)
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=1)
+        results = await asyncio.wait_for(asyncio.gather(*futures), 1)
+        await asyncio.wait_for(task, 1)
+        return waiter, task, results
+
+    waiter, task, results = asyncio.run(wait_all())
+
+    assert [(result.event, result.args) for result in results] == [
+        ("PlayerWithRandomness", {"tokenId": 1}),
+        ("PlayerWithRandomness", {"tokenId": 2}),
+        ("gameRequested", {"gameId": 1}),
+    ]
+    assert waiter.task is task and waiter.pending == []
+    # A single loop polls both contracts, each block is scanned once
+    assert all(
+        sorted(params["address"]) == ["0xA", "0xB"] for params in fake_chain.calls
+    )
+    assert fake_chain.calls[0]["fromBlock"] == 12
+    assert all(
+        params["fromBlock"] == previous["toBlock"] + 1
+        for previous, params in zip(fake_chain.calls, fake_chain.calls[1:])
+    )
+
+
+def test_new_poll_loop_starts_after_the_latest_block(fake_chain):
+    footballer = SimpleNamespace(address="0xA")
+
+    async def wait_twice():
+        waiter = EventWaiter(POLL_INTERVAL)
+        first = waiter.wait(footballer, "PlayerWithRandomness")
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=1)
+        await asyncio.wait_for(first, 1)
+        first_task = waiter.task
+        await asyncio.wait_for(first_task, 1)
+        # Mined while no loop is running
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=2)
+        second = waiter.wait(footballer, "PlayerWithRandomness")
+        assert waiter.task is not first_task
+        calls = len(fake_chain.calls)
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=3)
+        return (await asyncio.wait_for(second, 1)), fake_chain.calls[calls:]
+
+    result, second_calls = asyncio.run(wait_twice())
+
+    assert result.args == {"tokenId": 3}
+    assert second_calls[0]["fromBlock"] == 13
+
+
+def test_from_block_scans_the_blocks_before_the_call(fake_chain):
+    footballer = SimpleNamespace(address="0xA")
+    fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=1)
+
+    async def wait_from():
+        waiter = EventWaiter(POLL_INTERVAL)
+        return await asyncio.wait_for(
+            waiter.wait(footballer, "PlayerWithRandomness", {"tokenId": 1}, 11), 1
+        )
+
+    assert asyncio.run(wait_from()).args == {"tokenId": 1}
+
+
+def test_errors_are_raised_to_the_callers(fake_chain):
+    footballer = SimpleNamespace(address="0xA")
+
+    async def wait_all(errors):
+        fake_chain.errors = errors
+        waiter = EventWaiter(POLL_INTERVAL, max_errors=3)
+        futures = [
+            waiter.wait(footballer, "PlayerWithRandomness", {"tokenId": token_id})
+            for token_id in (1, 2)
+        ]
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=1)
+        fake_chain.emit("0xA", "PlayerWithRandomness", tokenId=2)
+        return await asyncio.wait_for(
+            asyncio.gather(*futures, return_exceptions=True), 1
+        )
+
+    # Errors in a row below max_errors are retried
+    results = asyncio.run(wait_all(2))
+    assert [result.args["tokenId"] for result in results] == [1, 2]
+
+    # Then every waiter gets the node error
+    results = asyncio.run(wait_all(3))
+    assert all(isinstance(result, ConnectionError) for result in results)
@@ -6,11 +6,17 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
+from scenarios import (
+    POSITIONS_PER_TEAM,
+    STAKE,
+    game_inputs,
+    sign_up_players,
+)
+from scripts.game_simulator import score_goals, simulate_games
 from brownie import network, exceptions
 
 
-def test_can_set_game_result_contract():
+def test_can_set_game_result_contract(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -24,7 +30,7 @@ def test_can_set_game_result_contract():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Set the address if already set should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -33,7 +39,7 @@ def test_can_set_game_result_contract():
         )
 
 
-def test_can_finish_game():
+def test_can_finish_game(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -48,7 +54,7 @@ def test_can_finish_game():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -181,3 +187,93 @@ def test_can_finish_game():
     # Finishing the game twice should fail
     with pytest.raises(exceptions.VirtualMachineError):
         league_game.finishGame(game_id, {"from": owner})
+
+
+def test_can_finish_full_teams_game(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    (_, kick_token, _, _, _, league_game, player_rate, _, _), league = league_scenario(
+        teams=2, players=11
+    )
+    game_id = league["game_id"]
+    home_team_id = league["home"]["team_id"]
+    away_team_id = league["away"]["team_id"]
+
+    # Shorten game duration in order to be able to finish the game
+    set_tx = player_rate.setGameDuration(0, {"from": owner})
+    set_tx.wait(1)
+    # Fund the contract
+    send_tx = kick_token.transfer(
+        league_game.address, Web3.toWei(100, "ether"), {"from": owner}
+    )
+    send_tx.wait(1)
+    accounts = (league["home"]["account"], league["away"]["account"])
+    old_balances = [kick_token.balanceOf(account) for account in accounts]
+    finish_tx = league_game.finishGame(game_id, {"from": owner})
+    finish_tx.wait(1)
+
+    # A full team defense average is far above any attack rate, no goal is scored
+    # The game is a draw and the stakes + price are split between both captains
+    payout = (2 * STAKE + league_game.prices(2)) // 2
+    for account, old_balance in zip(accounts, old_balances):
+        assert kick_token.balanceOf(account) == old_balance + payout
+    for team_id in (home_team_id, away_team_id):
+        for i in range(4):
+            assert league_game.teamGame(team_id, i) == 0
+    assert finish_tx.events["gameFinished"]["gameId"] == game_id
+    assert finish_tx.events["gameFinished"]["result"] == 3
+
+
+def finish_game(contracts, game_id):
+    # Settles the game from its inputs, returns them with the finishGame transaction
+    owner = get_account()
+    _, kick_token, _, _, _, league_game, player_rate, _, _ = contracts
+    set_tx = player_rate.setGameDuration(0, {"from": owner})
+    set_tx.wait(1)
+    send_tx = kick_token.transfer(
+        league_game.address, Web3.toWei(100, "ether"), {"from": owner}
+    )
+    send_tx.wait(1)
+    inputs = game_inputs(contracts, game_id)
+    finish_tx = league_game.finishGame(game_id, {"from": owner})
+    finish_tx.wait(1)
+    return inputs, finish_tx
+
+
+def test_simulated_game_matches_the_contract(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    _, _, _, _, _, _, player_rate, _, _ = contracts
+    game_id = league["game_id"]
+
+    inputs, finish_tx = finish_game(contracts, game_id)
+    home_goals, away_goals, results = simulate_games(*inputs, game_duration=0)
+
+    # The goals are not stored on-chain, score them again from the rates set by setPlayerRates
+    game_players = player_rate.getGamePlayers(game_id)
+    scored = score_goals(
+        [[player[0] for player in game_players]],
+        [[player[2] for player in game_players]],
+        [[player[3] for player in game_players]],
+    )
+    assert [goals[0] for goals in scored] == [home_goals[0], away_goals[0], results[0]]
+    assert finish_tx.events["gameFinished"]["result"] == results[0]
+
+
+def test_simulated_game_scores_against_zero_defense(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11, signed_up=False)
+    game_id = league["game_id"]
+
+    # Only the away team signs up, the home defense average is 0
+    sign_up_players(contracts, game_id, league["away"], POSITIONS_PER_TEAM)
+    inputs, finish_tx = finish_game(contracts, game_id)
+    home_goals, away_goals, results = simulate_games(*inputs, game_duration=0)
+
+    assert home_goals[0] == 0
+    assert away_goals[0] > 0
+    assert results[0] == 2
+    assert finish_tx.events["gameFinished"]["result"] == 2
@@ -6,12 +6,11 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network, exceptions
 from brownie.network.state import Chain
 
 
-def test_can_sign_up_team():
+def test_can_sign_up_team(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get two different accounts
@@ -28,7 +27,7 @@ def test_can_sign_up_team():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -106,7 +105,7 @@ def test_can_sign_up_team():
         league_game.signUpTeam(team_id, 8, Web3.toWei(4, "ether"), {"from": owner})
 
 
-def test_cancel_sign_up():
+def test_cancel_sign_up(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -121,7 +120,7 @@ def test_cancel_sign_up():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -192,7 +191,7 @@ def test_cancel_sign_up():
         league_game.cancelSignUp(team_id, {"from": owner})
 
 
-def test_can_challenge_team():
+def test_can_challenge_team(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -207,7 +206,7 @@ def test_can_challenge_team():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -326,7 +325,7 @@ def test_can_challenge_team():
         league_game.challengeTeam(first_team_id, third_team_id, {"from": owner})
 
 
-def test_can_decline_challenge():
+def test_can_decline_challenge(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -341,7 +340,7 @@ def test_can_decline_challenge():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -444,7 +443,7 @@ def test_can_decline_challenge():
         league_game.declineChallenge(second_team_id, first_team_id, {"from": not_owner})
 
 
-def test_can_request_game():
+def test_can_request_game(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -459,7 +458,7 @@ def test_can_request_game():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -559,7 +558,7 @@ def test_can_request_game():
         league_game.requestGame(first_team_id, second_team_id, {"from": owner})
 
 
-def test_can_set_game():
+def test_can_set_game(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -574,7 +573,7 @@ def test_can_set_game():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -654,7 +653,7 @@ def test_can_set_game():
     assert league_game.games(1, 0) < len(chain) + 604800 + 43200
 
 
-def test_can_set_challenge_time():
+def test_can_set_challenge_time(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -669,7 +668,7 @@ def test_can_set_challenge_time():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the time from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -682,7 +681,7 @@ def test_can_set_challenge_time():
     assert set_tx.events["updateChallengeTime"]["time"] == 10
 
 
-def test_can_set_prices():
+def test_can_set_prices(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -697,7 +696,7 @@ def test_can_set_prices():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the prices from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -718,7 +717,7 @@ def test_can_set_prices():
     assert set_tx.events["updatePrices"]["declinePrice"] == Web3.toWei(2, "ether")
 
 
-def test_can_set_game_delay():
+def test_can_set_game_delay(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -733,7 +732,7 @@ def test_can_set_game_delay():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the prices from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -748,7 +747,7 @@ def test_can_set_game_delay():
     assert set_tx.events["updateGameDelay"]["maxTime"] == 1000
 
 
-def test_can_withdraw_link():
+def test_can_withdraw_link(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -763,7 +762,7 @@ def test_can_withdraw_link():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     link_token = get_contract("link_token")
     fund_with_link(league_game.address, owner, None, Web3.toWei(100, "ether"))
 
@@ -779,7 +778,7 @@ def test_can_withdraw_link():
     assert link_token.balanceOf(league_game) == 0
 
 
-def test_can_withdraw_kick():
+def test_can_withdraw_kick(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -794,7 +793,7 @@ def test_can_withdraw_kick():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     send_tx = kick_token.transfer(
         league_game, Web3.toWei(100, "ether"), {"from": owner}
     )
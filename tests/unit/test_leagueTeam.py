@@ -5,12 +5,11 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network, exceptions
 import pytest
 
 
-def test_can_create_team():
+def test_can_create_team(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get two different accounts
@@ -27,7 +26,7 @@ def test_can_create_team():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -121,7 +120,7 @@ def test_can_create_team():
         league_team.createTeam(token_id, {"from": owner})
 
 
-def test_can_remove_team():
+def test_can_remove_team(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -136,7 +135,7 @@ def test_can_remove_team():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -201,7 +200,7 @@ def test_can_remove_team():
         league_team.removeTeam(token_id, {"from": owner})
 
 
-def test_can_apply_for_team():
+def test_can_apply_for_team(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -216,7 +215,7 @@ def test_can_apply_for_team():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -341,7 +340,7 @@ def test_can_apply_for_team():
         league_team.applyForTeam(token_id, team_id, {"from": owner})
 
 
-def test_can_cancel_application():
+def test_can_cancel_application(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -356,7 +355,7 @@ def test_can_cancel_application():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -439,7 +438,7 @@ def test_can_cancel_application():
     cancel_tx.wait(1)
 
 
-def test_can_validate_application():
+def test_can_validate_application(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -454,7 +453,7 @@ def test_can_validate_application():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -601,7 +600,7 @@ def test_can_validate_application():
         league_team.validateApplication(token_id_24, team_id, {"from": not_owner})
 
 
-def test_can_clear_applications():
+def test_can_clear_applications(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -616,7 +615,7 @@ def test_can_clear_applications():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -679,7 +678,7 @@ def test_can_clear_applications():
     assert clear_tx.events["applicationsCleared"]["teamId"] == team_id
 
 
-def test_can_release_player():
+def test_can_release_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -694,7 +693,7 @@ def test_can_release_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -754,7 +753,7 @@ def test_can_release_player():
     assert release_tx.events["playerReleased"]["teamId"] == team_id
 
 
-def test_can_pay_release_clause():
+def test_can_pay_release_clause(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -769,7 +768,7 @@ def test_can_pay_release_clause():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -837,7 +836,7 @@ def test_can_pay_release_clause():
     )
 
 
-def test_can_withdraw():
+def test_can_withdraw(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -852,7 +851,7 @@ def test_can_withdraw():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     transfer_tx = kick_token.transfer(
         not_owner, kick_token.balanceOf(owner), {"from": owner}
     )
@@ -888,7 +887,7 @@ def test_can_withdraw():
     assert kick_token.balanceOf(owner) == Web3.toWei(10, "ether")
 
 
-def test_can_set_creation_price():
+def test_can_set_creation_price(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -903,7 +902,7 @@ def test_can_set_creation_price():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -941,7 +940,7 @@ def test_can_set_creation_price():
         league_team.createTeam(token_id, {"from": owner})
 
 
-def test_can_set_release_price():
+def test_can_set_release_price(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -956,7 +955,7 @@ def test_can_set_release_price():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
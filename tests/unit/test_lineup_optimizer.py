@@ -0,0 +1,62 @@
+import numpy as np
+from scripts.lineup_optimizer import best_lineups, score_layouts
+
+# Position attribute i is preferred on the layout code 10 + i
+POSITION_IDS = np.array([10 + i if i < 11 else 0 for i in range(256)], dtype=np.uint8)
+# Layout 0 has no code of the players, layout 1 has one code per player
+LAYOUT_POSITIONS = np.array([[90] * 16, list(range(10, 21)) + [0] * 5], dtype=np.uint8)
+
+
+def roster(members):
+    # Players 1 to 11 have the position attributes 0 to 10, player 12 duplicates player 11
+    attributes = np.zeros((16, 6), dtype=np.uint8)
+    attributes[1:12, 0] = range(11)
+    attributes[12, 0] = 10
+    attributes[1:13, 4:6] = 5
+    rosters = np.zeros((1, 23), dtype=np.uint16)
+    rosters[0, : len(members)] = members
+    return rosters, attributes
+
+
+def test_best_lineup_uses_the_preferred_positions():
+    rosters, attributes = roster(range(1, 12))
+
+    layouts, scores, lineups = best_lineups(
+        rosters, attributes, True, POSITION_IDS, LAYOUT_POSITIONS
+    )
+
+    assert layouts[0] == 1
+    assert list(lineups[0]) == list(range(1, 12)) + [0] * 5
+    # 11 home bonuses, 11 preferred positions and the captain, no substitute
+    assert scores[0] == 11 + 2 * 11 + 1
+    away_layouts, away_scores, _ = best_lineups(
+        rosters, attributes, False, POSITION_IDS, LAYOUT_POSITIONS
+    )
+    assert away_layouts[0] == 1
+    assert away_scores[0] == 2 * 11 + 1
+
+
+def test_short_roster_leaves_empty_positions():
+    rosters, attributes = roster([1, 2, 3])
+
+    scores, lineups = score_layouts(
+        rosters, attributes, True, POSITION_IDS, LAYOUT_POSITIONS
+    )
+
+    assert sorted(lineups[0, 1][lineups[0, 1] > 0]) == [1, 2, 3]
+    assert (lineups[0, 1] == 0).sum() == 13
+    assert scores[0, 1] == 3 + 2 * 3 + 1
+
+
+def test_captain_is_the_first_member():
+    # Player 12 shares the position of player 11, the captain bonus keeps player 12 on the field
+    rosters, attributes = roster([12] + list(range(1, 12)))
+    attributes[12, 4:6] = 0
+
+    scores, lineups = score_layouts(
+        rosters, attributes, False, POSITION_IDS, LAYOUT_POSITIONS
+    )
+
+    assert lineups[0, 1, 10] == 12
+    assert list(lineups[0, 1, 11:]) == [11, 0, 0, 0, 0]
+    assert scores[0, 1] == 2 * 11 + 1
@@ -0,0 +1,113 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from scripts import log_fetcher
+from scripts.log_fetcher import fetch_logs, fetch_many
+
+MAX_RANGE = 500  # Blocks accepted by the fake provider in one eth_getLogs call
+
+
+class FakeProvider:
+    # eth_getLogs of a provider refusing ranges above max_range, with a log every 10 blocks
+    def __init__(self, max_range=MAX_RANGE, delay=0):
+        self.max_range = max_range
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_logs(self, params):
+        from_block, to_block = params["fromBlock"], params["toBlock"]
+        with self.lock:
+            self.calls.append((params["address"], from_block, to_block))
+        time.sleep(self.delay)
+        if to_block - from_block + 1 > self.max_range:
+            raise ValueError(
+                {"code": -32005, "message": "query returned more than 10000 results"}
+            )
+        return [
+            {"address": params["address"], "blockNumber": block}
+            for block in range(from_block, to_block + 1)
+            if block % 10 == 0
+        ]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(log_fetcher, "web3", SimpleNamespace(eth=provider))
+    return provider
+
+
+def test_fetch_logs_splits_and_regrows_the_range(provider):
+    chunks = list(fetch_logs("0xA", 0, 9999, chunk_size=2000, target_logs=400))
+
+    # Every block is fetched once, in order
+    ends = [end for end, _ in chunks]
+    assert ends == sorted(ends) and ends[-1] == 9999
+    blocks = [log["blockNumber"] for _, logs in chunks for log in logs]
+    assert blocks == list(range(0, 10000, 10))
+    accepted = [(start, end) for _, start, end in provider.calls if end - start < 500]
+    assert accepted[0][0] == 0
+    assert all(
+        start == previous_end + 1
+        for (_, previous_end), (start, _) in zip(accepted, accepted[1:])
+    )
+    # 2000 and 1000 blocks are refused, then each sparse 500 blocks range is followed
+    # by a 1000 blocks attempt
+    sizes = [end - start + 1 for _, start, end in provider.calls]
+    assert sizes[:3] == [2000, 1000, 500]
+    assert sizes[3:5] == [1000, 500]
+
+
+def test_fetch_logs_raises_other_errors(provider):
+    provider.max_range = 0
+
+    # A single block still refused can not be split
+    with pytest.raises(ValueError):
+        list(fetch_logs("0xA", 0, 10, chunk_size=4))
+    assert [end - start + 1 for _, start, end in provider.calls] == [4, 2, 1]
+
+    provider.get_logs = lambda params: (_ for _ in ()).throw(ConnectionError("down"))
+    with pytest.raises(ConnectionError):
+        list(fetch_logs("0xA", 0, 10))
+
+
+def test_fetch_many_covers_every_range(provider):
+    ranges = [(f"0x{i}", i * 100, 3000 + i * 100) for i in range(6)]
+
+    fetched = {}
+    for address, end, logs in fetch_many(ranges, max_workers=3, chunk_size=700):
+        fetched.setdefault(address, []).append((end, logs))
+
+    for address, from_block, to_block in ranges:
+        ends = [end for end, _ in fetched[address]]
+        assert ends == sorted(ends) and ends[-1] == to_block
+        assert [log["blockNumber"] for _, logs in fetched[address] for log in logs] == [
+            block for block in range(from_block, to_block + 1) if block % 10 == 0
+        ]
+
+
+def test_fetch_many_stops_its_threads(provider):
+    provider.delay = 0.01
+    ranges = [(f"0x{i}", 0, 100000) for i in range(4)]
+    threads = threading.active_count()
+
+    # The consumer closes the generator after the first results
+    results = fetch_many(ranges, max_workers=4, put_timeout=0.01)
+    next(results)
+    results.close()
+    assert threading.active_count() == threads
+
+    # The consumer raises
+    with pytest.raises(KeyError):
+        for _ in fetch_many(ranges, max_workers=4, put_timeout=0.01):
+            raise KeyError()
+    assert threading.active_count() == threads
+
+
+def test_fetch_many_raises_worker_errors(provider):
+    provider.max_range = 0
+
+    with pytest.raises(ValueError):
+        list(fetch_many([("0xA", 0, 100), ("0xB", 0, 100)], chunk_size=1))
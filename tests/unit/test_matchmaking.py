@@ -0,0 +1,37 @@
+import numpy as np
+from web3 import Web3
+from scripts.matchmaking import goal_difference_matrix, rate_difference_matrix
+
+
+def league():
+    # Teams 0 and 1 field 11 players with a 5 defense and a 50 attack, team 2 has no member
+    attributes = np.zeros((32, 6), dtype=np.uint8)
+    attributes[1:23, 4] = 5
+    attributes[1:23, 5] = 50
+    rosters = np.zeros((3, 23), dtype=np.uint16)
+    rosters[0, :11] = range(1, 12)
+    rosters[1, :11] = range(12, 23)
+    layouts = np.array([8, 8, 8])
+    stakes = np.array([Web3.toWei(4, "ether")] * 3, dtype=object)
+    return rosters, layouts, stakes, attributes
+
+
+def test_goal_difference_matrix():
+    expected = goal_difference_matrix(*league())
+
+    # Only the empty team has a 0 defense sum, each of the 11 attackers above it scores
+    # as home or away team, 0.5 * (11 - (-11)) = 11
+    assert np.isnan(np.diag(expected)).all()
+    assert expected[0, 1] == expected[1, 0] == 0
+    assert expected[0, 2] == expected[1, 2] == 11
+    assert expected[2, 0] == expected[2, 1] == -11
+
+
+def test_rate_difference_matrix():
+    expected = rate_difference_matrix(*league())
+
+    assert np.isnan(np.diag(expected)).all()
+    assert np.allclose(np.nan_to_num(expected), -np.nan_to_num(expected.T))
+    # Teams 0 and 1 only differ by their player ids
+    assert expected[0, 1] == 0
+    assert expected[0, 2] > 0 and expected[1, 2] > 0
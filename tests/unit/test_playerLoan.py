@@ -6,13 +6,12 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network, exceptions
 from brownie.network.state import Chain
 import pytest
 
 
-def test_can_list_player():
+def test_can_list_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get two different accounts
@@ -29,7 +28,7 @@ def test_can_list_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -83,7 +82,7 @@ def test_can_list_player():
     assert player_loan.getLoanListArray() == (player_id,)
 
 
-def test_can_unlist_player():
+def test_can_unlist_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -98,7 +97,7 @@ def test_can_unlist_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -135,7 +134,7 @@ def test_can_unlist_player():
     assert player_loan.getLoanListArray() == (0,)
 
 
-def test_can_loan_player():
+def test_can_loan_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -150,7 +149,7 @@ def test_can_loan_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -227,7 +226,7 @@ def test_can_loan_player():
     assert player_loan.getLoanListArray() == (0,)
 
 
-def test_can_withdraw():
+def test_can_withdraw(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -242,7 +241,7 @@ def test_can_withdraw():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -284,7 +283,7 @@ def test_can_withdraw():
     )
 
 
-def test_can_set_maximum_duration():
+def test_can_set_maximum_duration(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -299,7 +298,7 @@ def test_can_set_maximum_duration():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Set the price with an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
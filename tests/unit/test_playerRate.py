@@ -5,14 +5,16 @@ from scripts.helpful_scripts import (
     get_account,
     get_contract,
     fund_with_link,
+    mine_blocks,
+    BLOCK_TIME,
 )
-from scripts.deploy import deploy
-from scripts.store_positions_layouts import store_positions, store_layouts
+from scenarios import game_inputs
+from scripts.player_rates import HOME_PLAYERS, player_rates
 from brownie import network, exceptions
 from brownie.network.state import Chain
 
 
-def test_can_store_positions():
+def test_can_store_positions(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -27,7 +29,7 @@ def test_can_store_positions():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Store a position from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -41,7 +43,7 @@ def test_can_store_positions():
     assert store_position_tx.events["positionStored"]["positionCode"] == 11
 
 
-def test_can_store_layouts():
+def test_can_store_layouts(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -56,7 +58,7 @@ def test_can_store_layouts():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Store a position from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -109,7 +111,71 @@ def test_can_store_layouts():
     ]
 
 
-def test_can_sign_up_player():
+def test_can_store_positions_and_layouts_in_batch(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    not_owner = get_account(index=1)
+    (
+        _,
+        _,
+        _,
+        _,
+        _,
+        _,
+        player_rate,
+        _,
+        _,
+    ) = deployed
+
+    # The deployment stores the positions and layouts files with the batch setters
+    assert player_rate.positionIds(5) == 1
+    assert player_rate.positionIds(110) == 110
+    assert player_rate.layoutPositions(4, 0) == 110
+    assert player_rate.layoutPositions(4, 8) == 31
+    assert player_rate.layoutPositions(4, 15) == 33
+
+    # Store from an account not owner should fail
+    with pytest.raises(exceptions.VirtualMachineError):
+        player_rate.storePositions([0] * 256, {"from": not_owner})
+    with pytest.raises(exceptions.VirtualMachineError):
+        player_rate.storeLayouts(20, [[0] * 16], {"from": not_owner})
+
+    position_codes = [i % 34 for i in range(256)]
+    store_positions_tx = player_rate.storePositions(position_codes, {"from": owner})
+    store_positions_tx.wait(1)
+
+    assert player_rate.positionIds(0) == 0
+    assert player_rate.positionIds(45) == 11
+    assert player_rate.positionIds(255) == 17
+    # keccak256(abi.encode(uint8[256])), each code is padded to 32 bytes
+    assert (
+        store_positions_tx.events["positionsStored"]["positionCodesHash"]
+        == Web3.keccak(
+            b"".join(code.to_bytes(32, "big") for code in position_codes)
+        ).hex()
+    )
+
+    layouts_positions = [[i] * 16 for i in range(3)]
+    layouts_positions[2][15] = 33
+    store_layouts_tx = player_rate.storeLayouts(20, layouts_positions, {"from": owner})
+    store_layouts_tx.wait(1)
+
+    assert player_rate.layoutPositions(20, 0) == 0
+    assert player_rate.layoutPositions(21, 7) == 1
+    assert player_rate.layoutPositions(22, 14) == 2
+    assert player_rate.layoutPositions(22, 15) == 33
+    assert player_rate.layoutPositions(4, 0) == 110
+    # A layout has 16 positions, the positions above are not set
+    assert player_rate.layoutPositions(4, 16) == 0
+    assert player_rate.layoutPositions(4, 255) == 0
+    assert store_layouts_tx.events["layoutsStored"]["firstLayoutId"] == 20
+    assert store_layouts_tx.events["layoutsStored"]["layoutsPositions"] == (
+        layouts_positions
+    )
+
+
+def test_can_sign_up_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -124,7 +190,7 @@ def test_can_sign_up_player():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -291,7 +357,7 @@ def test_can_sign_up_player():
         )
 
 
-def test_can_calculate_players_rates():
+def test_can_calculate_players_rates(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -306,7 +372,7 @@ def test_can_calculate_players_rates():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -421,7 +487,56 @@ def test_can_calculate_players_rates():
     )
 
 
-def test_can_set_game_duration():
+def test_can_calculate_full_teams_rates(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    (_, _, _, _, _, _, player_rate, _, _), league = league_scenario(teams=2, players=11)
+    game_id = league["game_id"]
+
+    # Shorten game duration in order to be able to calculate the rates
+    set_tx = player_rate.setGameDuration(0, {"from": owner})
+    set_tx.wait(1)
+    calculate_tx = player_rate.setPlayerRates(game_id, {"from": owner})
+    calculate_tx.wait(1)
+
+    assert len(league["positions"]) == 22
+    for player_id, position in league["positions"].items():
+        assert player_rate.playerLastGame(player_id) == game_id
+        assert player_rate.isPlayerSignedUp(player_id) == False
+        assert player_rate.gamePlayers(game_id, position)[0] == player_id
+
+
+def test_can_calculate_rates_at_the_end_of_the_game(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    (_, _, _, _, _, league_game, player_rate, _, _), league = league_scenario(
+        teams=2, players=11
+    )
+    game_id = league["game_id"]
+
+    # Calculate the rates before the end of the game should fail
+    with pytest.raises(exceptions.VirtualMachineError):
+        player_rate.setPlayerRates(game_id, {"from": owner})
+
+    # Skip the game duration, the rates are calculated in the next block
+    chain = Chain()
+    game_end = league_game.games(game_id, 0) + player_rate.gameDuration()
+    blocks = game_end - len(chain)  # len(chain) is the height + 1
+    time = chain.time()
+    assert mine_blocks(blocks) == game_end - 1
+    assert chain.time() >= time + blocks * BLOCK_TIME
+
+    calculate_tx = player_rate.setPlayerRates(game_id, {"from": owner})
+    calculate_tx.wait(1)
+
+    assert calculate_tx.block_number == game_end
+    for player_id in league["positions"]:
+        assert player_rate.playerLastGame(player_id) == game_id
+
+
+def test_can_set_game_duration(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -436,7 +551,7 @@ def test_can_set_game_duration():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the prices from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -449,7 +564,7 @@ def test_can_set_game_duration():
     assert set_tx.events["updateGameDuration"]["duration"] == 3000
 
 
-def test_can_set_duration_between_games():
+def test_can_set_duration_between_games(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -464,7 +579,7 @@ def test_can_set_duration_between_games():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the prices from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -477,7 +592,7 @@ def test_can_set_duration_between_games():
     assert set_tx.events["updateDurationBetweenGames"]["duration"] == 300000
 
 
-def test_can_set_preregistration():
+def test_can_set_preregistration(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -492,7 +607,7 @@ def test_can_set_preregistration():
         player_rate,
         _,
         _,
-    ) = deploy()
+    ) = deployed
 
     # Change the prices from an account not owner should fail
     with pytest.raises(exceptions.VirtualMachineError):
@@ -503,3 +618,31 @@ def test_can_set_preregistration():
 
     assert player_rate.preRegistration() == 300000
     assert set_tx.events["updatePreRegistration"]["duration"] == 300000
+
+
+def test_player_rates_match_the_contract(league_scenario):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    contracts, league = league_scenario(teams=2, players=11)
+    _, _, _, _, _, _, player_rate, _, _ = contracts
+    game_id = league["game_id"]
+
+    set_tx = player_rate.setGameDuration(0, {"from": owner})
+    set_tx.wait(1)
+    inputs = game_inputs(contracts, game_id)
+    sign_up_blocks = [player[1] for player in player_rate.getGamePlayers(game_id)]
+    calculate_tx = player_rate.setPlayerRates(game_id, {"from": owner})
+    calculate_tx.wait(1)
+    _, defense_rates, attack_rates = player_rates(*inputs, game_duration=0)
+
+    game_players = player_rate.getGamePlayers(game_id)
+    assert [player[2] for player in game_players] == list(defense_rates[0])
+    assert [player[3] for player in game_players] == list(attack_rates[0])
+    # The home players keep the block read from gamePlayers[playerId], the away ones their sign up block
+    block_signed = inputs[2][0]
+    for position, player in enumerate(game_players):
+        if position in HOME_PLAYERS:
+            assert player[1] == block_signed[position]
+        else:
+            assert player[1] == sign_up_blocks[position]
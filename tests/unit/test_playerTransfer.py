@@ -5,13 +5,12 @@ from scripts.helpful_scripts import (
     get_contract,
     fund_with_link,
 )
-from scripts.deploy import deploy
 from brownie import network, exceptions
 from brownie.network.state import Chain
 import pytest
 
 
-def test_can_list_player():
+def test_can_list_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get two different accounts
@@ -28,7 +27,7 @@ def test_can_list_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -82,7 +81,7 @@ def test_can_list_player():
     assert player_transfer.getTransferListArray() == (token_id,)
 
 
-def test_can_unlist_player():
+def test_can_unlist_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -97,7 +96,7 @@ def test_can_unlist_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -136,7 +135,7 @@ def test_can_unlist_player():
     assert player_transfer.getTransferListArray() == (0,)
 
 
-def test_can_transfer_player():
+def test_can_transfer_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -151,7 +150,7 @@ def test_can_transfer_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -223,7 +222,7 @@ def test_can_transfer_player():
     assert player_transfer.getTransferListArray() == (0,)
 
 
-def test_can_withdraw():
+def test_can_withdraw(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -238,7 +237,7 @@ def test_can_withdraw():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
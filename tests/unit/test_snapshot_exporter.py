@@ -0,0 +1,73 @@
+import os
+from decimal import Decimal
+import pytest
+import pyarrow.parquet as pq
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.snapshot_exporter import SCHEMAS, export_snapshot, export_table
+from brownie import network, web3
+
+CHUNK_SIZE = 4
+
+
+def test_can_export_and_read_back_a_snapshot(league_scenario, tmp_path):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    contracts, league = league_scenario(teams=2, players=11)
+    verifiable_random_footballer, _, _, _, league_team, _, _, _, _ = contracts
+    block_number = web3.eth.block_number
+
+    # 30 token ids, of which the 22 players of the league are minted
+    directory, exported = export_snapshot(
+        block_number, str(tmp_path), chunk_size=CHUNK_SIZE, max_supply=31
+    )
+
+    assert directory == os.path.join(str(tmp_path), str(block_number))
+    assert sorted(os.listdir(directory)) == sorted(
+        f"{name}.parquet" for name in SCHEMAS
+    )
+    footballers = pq.ParquetFile(os.path.join(directory, "footballers.parquet"))
+    assert (
+        footballers.schema_arrow.metadata[b"block_number"] == str(block_number).encode()
+    )
+    # One row group per chunk of token ids, the chunks without minted token are skipped
+    assert [
+        footballers.metadata.row_group(i).num_rows
+        for i in range(footballers.num_row_groups)
+    ] == [CHUNK_SIZE] * 5 + [2]
+    minted = [player_id for team in league["teams"] for player_id in team["player_ids"]]
+    rows = footballers.read().to_pylist()
+    assert exported["footballers"] == len(rows) == len(minted)
+    assert [row["token_id"] for row in rows] == sorted(minted)
+    for row in rows:
+        assert row["owner"] == verifiable_random_footballer.ownerOf(row["token_id"])
+        assert row["team_id"] == league_team.playersTeam(row["token_id"])
+        assert [row[f"attribute_{i}"] for i in range(6)] == [
+            verifiable_random_footballer.tokenIdToAttributes(row["token_id"], i)
+            for i in range(6)
+        ]
+    memberships = pq.read_table(
+        os.path.join(directory, "memberships.parquet")
+    ).to_pylist()
+    assert len(memberships) == exported["memberships"] == len(minted)
+    assert exported["games"] == 1
+    assert exported["game_players"] == 22
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    path = str(tmp_path / "transfer_listings.parquet")
+
+    def read_rows(ids, block_number):
+        if ids[0] > CHUNK_SIZE:
+            raise ValueError("read failed")
+        return [[token_id, Decimal(0)] for token_id in ids]
+
+    with pytest.raises(ValueError):
+        export_table(
+            path,
+            SCHEMAS["transfer_listings"],
+            list(range(1, 3 * CHUNK_SIZE)),
+            read_rows,
+            1,
+            CHUNK_SIZE,
+        )
+    assert os.listdir(str(tmp_path)) == []
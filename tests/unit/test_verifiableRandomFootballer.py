@@ -1,16 +1,22 @@
+import asyncio
 from web3 import Web3
+from scripts import mint
 from scripts.helpful_scripts import (
     LOCAL_BLOCKCHAIN_ENVIRONMENTS,
+    EventWaiter,
     fund_with_link,
     get_account,
     get_contract,
 )
-from scripts.deploy import deploy
+from scenarios import RANDOM_SEED, mint_players
+from scripts.footballer_attributes import build_attributes_table, fetch_seeds
+from scripts.footballer_metadata import attributes_from_seed
+import multiprocessing
 from brownie import network, exceptions
 import pytest
 
 
-def test_can_request_tokenId():
+def test_can_request_tokenId(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     # Get an account
@@ -26,7 +32,7 @@ def test_can_request_tokenId():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -46,7 +52,7 @@ def test_can_request_tokenId():
         )
 
 
-def test_can_mint_token():
+def test_can_mint_token(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -60,7 +66,7 @@ def test_can_mint_token():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -81,7 +87,7 @@ def test_can_mint_token():
     assert token_owner == owner.address
 
 
-def test_can_generate_player():
+def test_can_generate_player(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -96,7 +102,7 @@ def test_can_generate_player():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(
         verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
     )
@@ -132,7 +138,67 @@ def test_can_generate_player():
         verifiable_random_footballer.generatePlayer(3, {"from": owner})
 
 
-def test_can_withdraw():
+def test_can_mint_players_concurrently(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    account = get_account(index=1)
+    verifiable_random_footballer = deployed[0]
+    fund_with_link(
+        verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
+    )
+    vrf_coordinator = get_contract("vrf_coordinator")
+    token_ids = [1, 2, 3]
+
+    async def answer_requests():
+        # Plays the Chainlink node, each request is answered once its event is mined
+        waiter = EventWaiter(poll_interval=0.1)
+        requests = [
+            waiter.wait(
+                verifiable_random_footballer, "requestedPlayer", {"tokenId": token_id}
+            )
+            for token_id in token_ids
+        ]
+        loop = asyncio.get_running_loop()
+        for request in asyncio.as_completed(requests):
+            requested_event = await request
+            await loop.run_in_executor(
+                None,
+                lambda: vrf_coordinator.callBackWithRandomness(
+                    requested_event.args["requestId"],
+                    RANDOM_SEED + requested_event.args["tokenId"],
+                    verifiable_random_footballer.address,
+                    {"from": owner},
+                ),
+            )
+
+    async def mint_with_node():
+        _, minted = await asyncio.gather(
+            answer_requests(),
+            mint.mint_players(
+                verifiable_random_footballer,
+                account,
+                len(token_ids),
+                max_generating=2,
+                timeout=60,
+                poll_interval=0.1,
+            ),
+        )
+        return minted
+
+    minted = asyncio.run(mint_with_node())
+
+    assert sorted(minted) == token_ids
+    for token_id in token_ids:
+        assert verifiable_random_footballer.ownerOf(token_id) == account.address
+        assert verifiable_random_footballer.tokenURI(token_id) != ""
+        assert [
+            verifiable_random_footballer.tokenIdToAttributes(token_id, i)
+            for i in range(6)
+        ] == attributes_from_seed(RANDOM_SEED + token_id)
+
+
+def test_can_withdraw(deployed):
     if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
         pytest.skip("Only for local testing")
     owner = get_account()
@@ -147,7 +213,7 @@ def test_can_withdraw():
         _,
         _,
         _,
-    ) = deploy()
+    ) = deployed
     fund_with_link(verifiable_random_footballer.address)
     ownerOldBalance = owner.balance()
     request_tx = verifiable_random_footballer.requestPlayer(
@@ -165,3 +231,39 @@ def test_can_withdraw():
 
     assert owner.balance() == ownerOldBalance + Web3.toWei(1, "ether")
     assert verifiable_random_footballer.balance() == 0
+
+
+def test_attributes_from_seed_match_the_contract(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    owner = get_account()
+    verifiable_random_footballer, _, _, _, _, _, _, _, _ = deployed
+    fund_with_link(
+        verifiable_random_footballer.address, owner, None, Web3.toWei(100, "ether")
+    )
+    # The first 11 seeds include goalkeepers and a wrapped attack score (token 8)
+    token_ids = mint_players(verifiable_random_footballer, owner, 11)
+    seeds = fetch_seeds(verifiable_random_footballer)
+
+    assert sorted(seeds) == token_ids
+    for token_id in token_ids:
+        assert attributes_from_seed(seeds[token_id]) == [
+            verifiable_random_footballer.tokenIdToAttributes(token_id, i)
+            for i in range(6)
+        ]
+
+
+def test_can_build_attributes_table_in_spawned_processes():
+    # Spawned workers import the port outside of the brownie project
+    seeds = {token_id: 5665498700435978654 + token_id for token_id in range(1, 12)}
+    table = build_attributes_table(
+        seeds,
+        max_workers=2,
+        chunk_size=4,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    assert table.shape == (10000, 6)
+    assert not table[0].any() and not table[12:].any()
+    for token_id, seed in seeds.items():
+        assert list(table[token_id]) == attributes_from_seed(seed)
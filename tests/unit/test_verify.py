@@ -0,0 +1,84 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+from scripts.helpful_scripts import LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.verify import verify
+from brownie import network
+
+
+class StubExplorer(BaseHTTPRequestHandler):
+    # Etherscan getsourcecode API, answering an error to the first request of each address
+    verified = set()
+    requested = set()
+
+    def do_GET(self):
+        address = parse_qs(urlparse(self.path).query)["address"][0]
+        if address not in self.requested:
+            self.requested.add(address)
+            self.send_response(502)
+            self.end_headers()
+            return
+        body = {
+            "status": "1",
+            "message": "OK",
+            "result": [{"SourceCode": "source" if address in self.verified else ""}],
+        }
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def test_can_verify_contracts_with_retries(deployed):
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        pytest.skip("Only for local testing")
+    (
+        verifiable_random_footballer,
+        kick_token,
+        player_transfer,
+        player_loan,
+        _,
+        _,
+        _,
+        _,
+        _,
+    ) = deployed
+    server = HTTPServer(("127.0.0.1", 0), StubExplorer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api"
+    published = []
+
+    def publish(container, contract):
+        published.append(contract.address)
+        StubExplorer.verified.add(contract.address)
+        return True
+
+    # KickToken is already verified on the explorer, PlayerLoan in the cached status
+    StubExplorer.verified.add(kick_token.address)
+    manifest = {
+        name: {"contract": contract._name, "address": contract.address}
+        for name, contract in [
+            ("verifiable_random_footballer", verifiable_random_footballer),
+            ("kick_token", kick_token),
+            ("player_transfer", player_transfer),
+            ("player_loan", player_loan),
+        ]
+    }
+    manifest["player_loan"]["verified"] = True
+    results = verify(manifest, url, publish, backoff=0)
+    server.shutdown()
+
+    assert results == {
+        "verifiable_random_footballer": True,
+        "kick_token": True,
+        "player_transfer": True,
+    }
+    assert sorted(published) == sorted(
+        [verifiable_random_footballer.address, player_transfer.address]
+    )
+    assert player_loan.address not in StubExplorer.requested
+    assert all(entry["verified"] for entry in manifest.values())